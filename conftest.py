@@ -0,0 +1,3 @@
+# The rootdir conftest puts the project root on sys.path, so the harness package
+# imports without path hacks; its plugin provides all shared fixtures and hooks.
+pytest_plugins = ["harness.plugin"]
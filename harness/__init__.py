@@ -0,0 +1,9 @@
+"""Test harness for the automationintesting.online booking platform
+
+Kept import-light on purpose: API helpers live in ``harness.utils`` and the
+Playwright-dependent UI helpers in ``harness.ui`` are only imported when a UI
+fixture from ``harness.plugin`` is requested.
+"""
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
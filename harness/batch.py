@@ -0,0 +1,228 @@
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from harness.utils import AmbiguousApiError, ApiError
+
+MARKER_PATTERN = re.compile(r"aqa-([0-9a-f]{16})")
+
+
+def new_marker():
+    """Client-generated idempotency marker carried inside the created object"""
+    return uuid.uuid4().hex[:16]
+
+
+def tag_room(room_data, marker):
+    """Room payload with the marker appended to its description"""
+    description = room_data.get("description") or ""
+    return dict(room_data, description=f"{description} [aqa-{marker}]".strip())
+
+
+def tag_booking(payload, marker):
+    """Booking payload with the marker as a plus-tag of the email local part"""
+    local, _, domain = payload["email"].partition("@")
+    return dict(payload, email=f"{local.split('+')[0]}+aqa-{marker}@{domain}")
+
+
+def find_marker(text):
+    match = MARKER_PATTERN.search(text or "")
+    return match.group(1) if match else None
+
+
+class BatchCreationError(Exception):
+    """Some specs could not be created; ``result`` holds what was, ``failures`` maps index to error
+
+    Passing ``result.markers`` back to the same create call resumes the batch
+    without duplicating anything that was already created.
+    """
+
+    def __init__(self, message, result, failures):
+        super().__init__(message)
+        self.result = result
+        self.failures = failures
+
+
+class BatchResult:
+    """IDs created for a batch, index-aligned with its specs"""
+
+    def __init__(self, markers):
+        self.markers = list(markers)
+        self.ids = [None] * len(self.markers)
+        self.reconciled = 0
+        self.duplicates_removed = 0
+
+    def mapping(self, specs=None):
+        """Pairs of (spec, ID), or (index, ID) when no specs are given"""
+        keys = specs if specs is not None else range(len(self.ids))
+        return list(zip(keys, self.ids))
+
+
+class BatchCreator:
+    """Creates many rooms or bookings concurrently without duplicating any of them
+
+    Every spec is tagged with a client-generated marker (room description,
+    booking email plus-tag). When a create fails ambiguously - timeout,
+    dropped connection, 5xx - the target is searched for the marker before
+    retrying, so an object the server did create is adopted instead of
+    created again. Extra copies found under one marker are deleted.
+    """
+
+    def __init__(self, utils, workers=None, retries=None, backoff=0.5):
+        config = utils.test_data.get("batch", {})
+        self.utils = utils
+        self.workers = workers or config.get("workers", 8)
+        self.retries = retries or config.get("retries", 3)
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        # kind -> (tag, post, find, delete)
+        self._operations = {
+            "room": (tag_room, self._post_room, self._find_rooms, self._delete_room),
+            "booking": (tag_booking, self._post_booking, self._find_bookings, self._delete_booking)
+        }
+
+    def _headers(self):
+        token = self.utils.get_admin_auth_token()
+        if not token:
+            raise ApiError("Failed to get admin token")
+        return {
+            "Content-Type": "application/json",
+            "Cookie": f"token={token}",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
+
+    def _post_room(self, payload):
+        result = self.utils.create_room(f"{self.utils.base_url}/room", payload, self._headers())
+        return result.get("roomid") or result.get("id")
+
+    def _find_rooms(self, payload, marker):
+        return sorted(room.get("roomid") or room.get("id") for room in self.utils.list_rooms()
+                      if find_marker(room.get("description")) == marker)
+
+    def _delete_room(self, room_id):
+        return self.utils.delete_room(f"{self.utils.base_url}/room", room_id, self._headers())
+
+    def create_rooms(self, specs, markers=None):
+        """Create one room per spec (overrides of the default room data); returns a BatchResult
+
+        ``markers`` from an earlier BatchResult or BatchCreationError resume that batch.
+        """
+        defaults = self.utils.test_data["room_data"]
+        payloads = [dict(defaults, **(spec or {})) for spec in specs]
+        existing = {}
+        if markers:
+            for room in self.utils.list_rooms():
+                marker = find_marker(room.get("description"))
+                if marker:
+                    existing.setdefault(marker, []).append(room.get("roomid") or room.get("id"))
+        return self._run("room", payloads, markers, existing)
+
+    def _post_booking(self, payload):
+        result = self.utils.create_booking(f"{self.utils.base_url}/booking/", payload)
+        return result.get("bookingid") or result.get("id")
+
+    def _find_bookings(self, payload, marker):
+        found = []
+        for booking in self.utils.list_room_bookings(payload["roomid"]):
+            if "email" in booking:
+                matches = find_marker(booking["email"]) == marker
+            else:
+                # Without the email, the room and dates identify it: overlapping bookings are rejected
+                matches = (booking.get("bookingdates") == payload["bookingdates"]
+                           and booking.get("firstname") == payload["firstname"]
+                           and booking.get("lastname") == payload["lastname"])
+            if matches:
+                found.append(booking.get("bookingid") or booking.get("id"))
+        return sorted(found)
+
+    def _delete_booking(self, booking_id):
+        return self.utils.delete_booking(f"{self.utils.base_url}/booking", booking_id, self._headers())
+
+    def create_bookings(self, specs, markers=None):
+        """Create one booking per spec; returns a BatchResult
+
+        A spec holds the keyword arguments of ``utils.build_booking_payload``
+        (``room_id`` and optionally ``booking_data``, ``checkin``, ``checkout``).
+        """
+        payloads = [self.utils.build_booking_payload(**spec) for spec in specs]
+        existing = {}
+        if markers:
+            for room_id in {payload["roomid"] for payload in payloads}:
+                for booking in self.utils.list_room_bookings(room_id):
+                    marker = find_marker(booking.get("email"))
+                    if marker:
+                        existing.setdefault(marker, []).append(booking.get("bookingid") or booking.get("id"))
+        return self._run("booking", payloads, markers, existing)
+
+    def _adopt(self, kind, found, result):
+        """Keep the oldest object under a marker, delete the rest and return the kept ID"""
+        delete = self._operations[kind][3]
+        keep, extra = found[0], found[1:]
+        self.utils.ledger.record(kind, keep, self.utils.base_url)
+        for object_id in extra:
+            self.utils.ledger.record(kind, object_id, self.utils.base_url)
+            delete(object_id)
+        with self._lock:
+            result.reconciled += 1
+            result.duplicates_removed += len(extra)
+        return keep
+
+    def _create_one(self, kind, payload, marker, result):
+        """Create one object, looking up its marker after every ambiguous failure"""
+        _, post, find, _ = self._operations[kind]
+        uncertain = False
+        error = None
+        for attempt in range(self.retries):
+            if uncertain:
+                try:
+                    found = find(payload, marker)
+                except ApiError as e:
+                    error = e
+                    time.sleep(self.backoff * 2 ** attempt)
+                    continue
+                if found:
+                    return self._adopt(kind, found, result)
+            try:
+                return post(payload)
+            except AmbiguousApiError as e:
+                uncertain, error = True, e
+                time.sleep(self.backoff * 2 ** attempt)
+            except ApiError as e:
+                # After an ambiguous attempt a rejection may be a conflict with that attempt's own object
+                if not uncertain:
+                    raise
+                error = e
+
+        if uncertain:
+            found = find(payload, marker)
+            if found:
+                return self._adopt(kind, found, result)
+        raise error
+
+    def _run(self, kind, payloads, markers, existing):
+        markers = list(markers) if markers else [new_marker() for _ in payloads]
+        if len(markers) != len(payloads):
+            raise ValueError(f"Got {len(markers)} markers for {len(payloads)} specs")
+        tag = self._operations[kind][0]
+        result = BatchResult(markers)
+
+        def create(index):
+            marker = markers[index]
+            if existing.get(marker):
+                result.ids[index] = self._adopt(kind, sorted(existing[marker]), result)
+            else:
+                result.ids[index] = self._create_one(kind, tag(payloads[index], marker), marker, result)
+
+        failures = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {index: executor.submit(create, index) for index in range(len(payloads))}
+            for index, future in futures.items():
+                try:
+                    future.result()
+                except ApiError as e:
+                    failures[index] = e
+
+        if failures:
+            raise BatchCreationError(f"Failed to create {len(failures)} of {len(payloads)} {kind}s", result, failures)
+        return result
@@ -0,0 +1,361 @@
+import itertools
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from harness.test_data import booking_field_limits
+from harness.utils import extract_error_messages
+
+MISSING = object()
+
+# Days reserved per fuzz case so accepted bookings never collide with each other
+WINDOW_DAYS = 3
+
+
+class Mutation:
+    """A single change applied to one field of the baseline booking payload
+
+    ``valid`` is True when the API must accept the value, False when it must
+    reject it and None when either answer is acceptable (only crashes count).
+    ``value`` may be a callable receiving the case's (checkin, checkout) dates.
+    """
+
+    def __init__(self, field, label, value, valid=False):
+        self.field = field
+        self.label = label
+        self.value = value
+        self.valid = valid
+
+    def resolve(self, checkin, checkout):
+        return self.value(checkin, checkout) if callable(self.value) else self.value
+
+    def __repr__(self):
+        return f"{self.field}:{self.label}"
+
+
+class FuzzCase:
+    """A combination of mutations submitted as one booking request"""
+
+    def __init__(self, mutations):
+        self.mutations = list(mutations)
+
+    @property
+    def expect_valid(self):
+        """True/False when the expected outcome is known, None otherwise"""
+        if any(m.valid is False for m in self.mutations):
+            return False
+        if all(m.valid is True for m in self.mutations):
+            return True
+        return None
+
+    @property
+    def name(self):
+        return " + ".join(repr(m) for m in self.mutations) or "baseline"
+
+    def __repr__(self):
+        return f"FuzzCase({self.name})"
+
+
+class FuzzResult:
+    """Response of the booking endpoint to one fuzz case"""
+
+    def __init__(self, case, payload, status=None, errors=None, booking_id=None, elapsed=0.0, exception=None):
+        self.case = case
+        self.payload = payload
+        self.status = status
+        self.errors = errors or []
+        self.booking_id = booking_id
+        self.elapsed = elapsed
+        self.exception = exception
+
+    @property
+    def signature(self):
+        """Response identity used to deduplicate failures: status plus normalized messages
+
+        An accepted invalid case has no messages to tell one bug from another,
+        so the fields whose values should have been rejected stand in for them.
+        """
+        status = self.status if self.exception is None else f"ERR:{type(self.exception).__name__}"
+        if self.finding == "accepted-invalid":
+            return status, tuple(sorted({m.field for m in self.case.mutations if m.valid is False}))
+        messages = sorted({re.sub(r"\d+", "N", message.lower()) for message in self.errors})
+        return status, tuple(messages)
+
+    @property
+    def finding(self):
+        """Kind of validation problem this response reveals, or None"""
+        if self.exception is not None:
+            return "transport-error"
+        if self.status >= 500:
+            return "server-error"
+        accepted = 200 <= self.status < 300
+        if accepted and self.case.expect_valid is False:
+            return "accepted-invalid"
+        if not accepted and self.case.expect_valid is True:
+            return "rejected-valid"
+        return None
+
+
+class FuzzReport:
+    """Fuzz results grouped by response signature"""
+
+    def __init__(self, results):
+        self.results = results
+        self.groups = {}
+        for result in results:
+            self.groups.setdefault((result.finding, result.signature), []).append(result)
+        self.reproductions = {}
+
+    @property
+    def findings(self):
+        """One representative result per distinct finding; groups that shrink to the same one count once"""
+        distinct = {}
+        for (finding, signature), group in self.groups.items():
+            if finding:
+                minimal = self.reproductions.get(id(group[0]), group[0])
+                distinct.setdefault((finding, minimal.signature), group[0])
+        return list(distinct.values())
+
+    def summary(self):
+        lines = [f"{len(self.results)} cases, {len(self.groups)} distinct responses, "
+                 f"{len(self.findings)} distinct findings"]
+        for (finding, signature), group in sorted(self.groups.items(), key=lambda item: -len(item[1])):
+            marker = finding.upper() if finding else "ok"
+            lines.append(f"  [{marker}] {signature[0]} x{len(group)}: {'; '.join(signature[1])[:200]}")
+            if finding:
+                minimal = self.reproductions.get(id(group[0]), group[0])
+                lines.append(f"      minimal: {minimal.case.name}")
+        return "\n".join(lines)
+
+
+class BookingFuzzer:
+    """Derives invalid and boundary payloads from the booking schema and submits them concurrently
+
+    Request rate is governed by the shared rate limiter behind ``utils.session``.
+    """
+
+    def __init__(self, utils, room_id, workers=None, max_cases=None, seed=None, field_limits=None):
+        config = utils.test_data.get("fuzzing", {})
+        self.utils = utils
+        self.room_id = room_id
+        self.workers = workers or config.get("workers", 8)
+        self.max_cases = max_cases or config.get("max_cases", 400)
+        self.field_limits = field_limits or booking_field_limits
+        self.random = random.Random(seed if seed is not None else config.get("seed", 1))
+
+        self.booking_url = f"{utils.base_url}/booking/"
+        self.headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
+
+        # Far-future date range, one window per submitted case
+        self.window_start = datetime.today().date() + timedelta(days=self.random.randint(365, 3 * 365))
+        self._windows = itertools.count()
+        self._lock = threading.Lock()
+        self.baseline_window = self.next_window()
+        self.created_booking_ids = []
+
+    def next_window(self):
+        with self._lock:
+            index = next(self._windows)
+        checkin = self.window_start + timedelta(days=index * WINDOW_DAYS)
+        return checkin, checkin + timedelta(days=1)
+
+    def build_payload(self, case, window):
+        checkin, checkout = window
+        payload = self.utils.build_booking_payload(self.room_id, self.utils.test_data["valid_booking_data"],
+                                                   checkin, checkout)
+        for mutation in case.mutations:
+            value = mutation.resolve(checkin, checkout)
+            if value is MISSING:
+                payload.pop(mutation.field, None)
+            else:
+                payload[mutation.field] = value
+        return payload
+
+    def _string_mutations(self, field):
+        mutations = [
+            Mutation(field, "empty", ""),
+            Mutation(field, "blank", "   "),
+            Mutation(field, "missing", MISSING),
+            Mutation(field, "null", None),
+            Mutation(field, "number", 12345),
+            Mutation(field, "list", ["John"]),
+            Mutation(field, "oversized", "a" * 10000),
+            Mutation(field, "unicode", "\u0490\u0430\u043d\u043d\u0430 \u017dofie", valid=None),
+            Mutation(field, "emoji", "\U0001F600" * 5, valid=None),
+            Mutation(field, "rtl-override", "\u202eJohnny", valid=None),
+            Mutation(field, "combining", "e\u0301" * 6, valid=None),
+            Mutation(field, "null-byte", "Jo\x00hnny", valid=None),
+            Mutation(field, "markup", "<script>alert(1)</script>", valid=None),
+            Mutation(field, "quote", "O'Brien\"; --", valid=None),
+        ]
+        limits = self.field_limits.get(field)
+        if limits:
+            low, high = limits
+            filler = "7" if field == "phone" else "a"
+            mutations += [
+                Mutation(field, f"len={low - 1}", filler * (low - 1)),
+                Mutation(field, f"len={low}", filler * low, valid=True),
+                Mutation(field, f"len={high}", filler * high, valid=True),
+                Mutation(field, f"len={high + 1}", filler * (high + 1)),
+            ]
+        return mutations
+
+    def mutations(self):
+        """All single-field mutations derived from the booking payload built by create_test_booking"""
+        mutations = []
+        for field in ("firstname", "lastname"):
+            mutations += self._string_mutations(field)
+
+        mutations += [m for m in self._string_mutations("email") if not m.label.startswith("len=")] + [
+            Mutation("email", "no-at", "not-an-email"),
+            Mutation("email", "no-domain", "john@"),
+            Mutation("email", "no-local", "@example.com"),
+            Mutation("email", "double-at", "john@@example.com"),
+            Mutation("email", "space", "john doe@example.com"),
+            Mutation("email", "oversized-local", "a" * 300 + "@example.com"),
+            Mutation("email", "plus-tag", "john.doe+fuzz@example.com", valid=True),
+            Mutation("email", "idn", "j\u00f6hn@ex\u00e4mple.com", valid=None),
+        ]
+
+        mutations += self._string_mutations("phone") + [
+            Mutation("phone", "letters", "abcdefghijkl", valid=None),
+            Mutation("phone", "formatted", "+44 7700 900123", valid=None),
+        ]
+
+        baseline_dates = {"checkin": self.baseline_window[0].strftime("%Y-%m-%d"),
+                          "checkout": self.baseline_window[1].strftime("%Y-%m-%d")}
+        mutations += [
+            Mutation("bookingdates", "missing", MISSING),
+            Mutation("bookingdates", "null", None),
+            Mutation("bookingdates", "inverted", lambda ci, co: {
+                "checkin": co.strftime("%Y-%m-%d"), "checkout": ci.strftime("%Y-%m-%d")}),
+            Mutation("bookingdates", "same-day", lambda ci, co: {
+                "checkin": ci.strftime("%Y-%m-%d"), "checkout": ci.strftime("%Y-%m-%d")}, valid=None),
+            Mutation("bookingdates", "no-checkout", lambda ci, co: {"checkin": ci.strftime("%Y-%m-%d")}),
+            Mutation("bookingdates", "bad-format", lambda ci, co: {
+                "checkin": ci.strftime("%d/%m/%Y"), "checkout": co.strftime("%d/%m/%Y")}),
+            Mutation("bookingdates", "impossible-date", {"checkin": "2031-02-30", "checkout": "2031-03-02"}),
+            Mutation("bookingdates", "past", {"checkin": "2001-01-01", "checkout": "2001-01-02"}, valid=None),
+            Mutation("bookingdates", "year-9999", {"checkin": "9999-12-30", "checkout": "9999-12-31"}, valid=None),
+            Mutation("bookingdates", "overlapping", baseline_dates),
+            Mutation("roomid", "missing", MISSING),
+            Mutation("roomid", "null", None),
+            Mutation("roomid", "string", "abc"),
+            Mutation("roomid", "zero", 0, valid=None),
+            Mutation("roomid", "negative", -1, valid=None),
+            Mutation("roomid", "nonexistent", 2 ** 31 - 1, valid=None),
+        ]
+        return mutations
+
+    def generate(self):
+        """Every single mutation, then a seeded sample of two-field combinations up to max_cases"""
+        singles = self.mutations()
+        cases = [FuzzCase([mutation]) for mutation in singles]
+        pairs = [(a, b) for a, b in itertools.combinations(singles, 2) if a.field != b.field]
+        self.random.shuffle(pairs)
+        cases += [FuzzCase(pair) for pair in pairs[:max(0, self.max_cases - len(cases))]]
+        return cases[:self.max_cases]
+
+    def submit(self, case, window=None):
+        """Submit one case and classify the response"""
+        payload = self.build_payload(case, window or self.next_window())
+        started = time.perf_counter()
+        try:
+            response = self.utils.session.post(self.booking_url, json=payload, headers=self.headers, timeout=30)
+        except Exception as e:
+            return FuzzResult(case, payload, elapsed=time.perf_counter() - started, exception=e)
+
+        result = FuzzResult(case, payload, status=response.status_code, elapsed=time.perf_counter() - started)
+        try:
+            body = response.json()
+        except ValueError:
+            body = response.text
+        if 200 <= response.status_code < 300:
+            result.booking_id = body.get("bookingid") if isinstance(body, dict) else None
+            if result.booking_id:
+                self.utils.ledger.record("booking", result.booking_id, self.utils.base_url)
+                with self._lock:
+                    self.created_booking_ids.append(result.booking_id)
+        else:
+            result.errors = extract_error_messages(body)
+        return result
+
+    def shrink(self, result, max_attempts=20):
+        """Reduce a failing case to the fewest mutations (and shortest values) that reproduce it
+
+        Returns the result of the smallest reproducing case, ``result`` itself if nothing smaller reproduces.
+        """
+        kind, signature = result.finding, result.signature
+        mutations = list(result.case.mutations)
+        minimal = result
+        attempts = 0
+
+        def reproduce(candidate):
+            reduced = self.submit(FuzzCase(candidate))
+            if reduced.finding != kind or reduced.signature[0] != signature[0]:
+                return None
+            # Two wrongly accepted fields shrink to either one, so the pair joins that field's finding
+            if kind == "accepted-invalid" and set(reduced.signature[1]) <= set(signature[1]):
+                return reduced
+            return reduced if reduced.signature == signature else None
+
+        index = 0
+        while len(mutations) > 1 and index < len(mutations) and attempts < max_attempts:
+            candidate = mutations[:index] + mutations[index + 1:]
+            attempts += 1
+            reduced = reproduce(candidate)
+            if reduced:
+                mutations, minimal = candidate, reduced
+            else:
+                index += 1
+
+        # Shortening values changes their validity, so only crashes are shrunk further
+        if kind in ("server-error", "transport-error"):
+            for index, mutation in enumerate(list(mutations)):
+                value = mutation.value
+                while isinstance(value, str) and len(value) > 1 and attempts < max_attempts:
+                    shorter = value[:len(value) // 2]
+                    candidate = list(mutations)
+                    candidate[index] = Mutation(mutation.field, f"{mutation.label}[:{len(shorter)}]", shorter,
+                                                mutation.valid)
+                    attempts += 1
+                    reduced = reproduce(candidate)
+                    if not reduced:
+                        break
+                    mutations, value, minimal = candidate, shorter, reduced
+
+        return minimal
+
+    def run(self, cases=None, shrink=True):
+        """Submit all cases concurrently, deduplicate by signature and shrink each distinct finding"""
+        baseline = self.submit(FuzzCase([]), self.baseline_window)
+        if not baseline.booking_id:
+            raise Exception(f"Baseline booking was rejected: Status {baseline.status}, {baseline.errors}")
+
+        cases = cases if cases is not None else self.generate()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(self.submit, cases))
+
+        report = FuzzReport(results)
+        if shrink:
+            for finding in report.findings:
+                report.reproductions[id(finding)] = self.shrink(finding)
+        return report
+
+    def cleanup(self):
+        """Delete every booking the API accepted during fuzzing"""
+        token = self.utils.get_admin_auth_token()
+        if not token:
+            return
+        headers = dict(self.headers, Cookie=f"token={token}")
+        booking_api = f"{self.utils.base_url}/booking"
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(lambda booking_id: self.utils.delete_booking(booking_api, booking_id, headers),
+                              self.created_booking_ids))
+        self.created_booking_ids = []
@@ -0,0 +1,200 @@
+"""Long-lived Chromium shared by UI test sessions
+
+    python -m harness.browser_server start [--headed] [--port 9333] [--idle-timeout 1800]
+    python -m harness.browser_server status
+    python -m harness.browser_server stop
+
+The server launches Chromium once with a local CDP endpoint and keeps it warm.
+Test sessions connect with ``connect_over_cdp`` and open their own browser
+contexts, so nothing leaks between sessions. Every connection refreshes a
+heartbeat file; after ``--idle-timeout`` seconds without one the server exits.
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+from harness import ROOT_DIR
+
+STATE_FILE = os.environ.get("BROWSER_SERVER_STATE", os.path.join(ROOT_DIR, ".browser_server.json"))
+HEARTBEAT_FILE = f"{STATE_FILE}.heartbeat"
+DEFAULT_PORT = 9333
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+HEALTH_CHECK_INTERVAL = 5
+
+
+def read_state():
+    try:
+        with open(STATE_FILE, "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_state(state):
+    temp_path = f"{STATE_FILE}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump(state, file)
+    os.replace(temp_path, STATE_FILE)
+
+
+def _remove_state():
+    for path in (STATE_FILE, HEARTBEAT_FILE):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def touch():
+    """Mark the server as in use so the idle timer restarts"""
+    with open(HEARTBEAT_FILE, "a"):
+        pass
+    os.utime(HEARTBEAT_FILE, None)
+
+
+def is_healthy(endpoint, timeout=2):
+    """The CDP endpoint answers /json/version with a debugger URL"""
+    try:
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=timeout) as response:
+            return response.status == 200 and "webSocketDebuggerUrl" in json.load(response)
+    except Exception:
+        return False
+
+
+def healthy_endpoint(headless=None):
+    """CDP endpoint of a running, healthy server (optionally with matching headless mode), else None"""
+    state = read_state()
+    if not state:
+        return None
+    if headless is not None and state.get("headless") != headless:
+        return None
+    if not is_healthy(state["endpoint"]):
+        return None
+    return state["endpoint"]
+
+
+def serve(port, headless, idle_timeout):
+    """Run the browser in the foreground until idle, unhealthy or signalled"""
+    from playwright.sync_api import sync_playwright
+
+    playwright = sync_playwright().start()
+    browser = playwright.chromium.launch(
+        headless=headless,
+        args=[f"--remote-debugging-port={port}", "--remote-debugging-address=127.0.0.1"]
+    )
+    endpoint = f"http://127.0.0.1:{port}"
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    signal.signal(signal.SIGINT, lambda *_: stopping.append(True))
+
+    _write_state({"pid": os.getpid(), "endpoint": endpoint, "headless": headless,
+                  "idle_timeout": idle_timeout, "started": time.time()})
+    touch()
+    print(f"[BROWSER SERVER] Listening on {endpoint} (headless={headless}, idle timeout {idle_timeout}s)")
+
+    try:
+        while not stopping:
+            time.sleep(HEALTH_CHECK_INTERVAL)
+            if not browser.is_connected() or not is_healthy(endpoint):
+                print("[BROWSER SERVER] Browser is unhealthy, shutting down")
+                break
+            idle = time.time() - os.path.getmtime(HEARTBEAT_FILE)
+            if idle > idle_timeout:
+                print(f"[BROWSER SERVER] Idle for {int(idle)}s, shutting down")
+                break
+    finally:
+        _remove_state()
+        try:
+            browser.close()
+        finally:
+            playwright.stop()
+
+
+def start(port, headless, idle_timeout, wait=30):
+    """Start the server in the background unless one is already healthy
+
+    A healthy server in the other headless mode is reported as a failure: sessions
+    only connect to a server whose mode matches theirs and would launch locally.
+    """
+    endpoint = healthy_endpoint(headless)
+    if endpoint:
+        print(f"[BROWSER SERVER] Already running on {endpoint}")
+        return True
+    endpoint = healthy_endpoint()
+    if endpoint:
+        print(f"[BROWSER SERVER] Already running on {endpoint} with headless={not headless}, "
+              f"requested headless={headless}; stop it first")
+        return False
+
+    command = [sys.executable, "-m", "harness.browser_server", "serve", "--port", str(port),
+               "--idle-timeout", str(idle_timeout)]
+    if not headless:
+        command.append("--headed")
+    log = open(f"{STATE_FILE}.log", "a")
+    subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                     start_new_session=True, cwd=ROOT_DIR)
+
+    deadline = time.time() + wait
+    while time.time() < deadline:
+        endpoint = healthy_endpoint(headless)
+        if endpoint:
+            print(f"[BROWSER SERVER] Started on {endpoint}")
+            return True
+        time.sleep(0.5)
+    print(f"[BROWSER SERVER] Did not become healthy within {wait}s, see {STATE_FILE}.log")
+    return False
+
+
+def stop():
+    state = read_state()
+    if not state:
+        print("[BROWSER SERVER] Not running")
+        return
+    try:
+        os.kill(state["pid"], signal.SIGTERM)
+        print(f"[BROWSER SERVER] Stopping pid {state['pid']}")
+    except ProcessLookupError:
+        _remove_state()
+        print("[BROWSER SERVER] Stale state removed")
+
+
+def status():
+    state = read_state()
+    if not state:
+        print("[BROWSER SERVER] Not running")
+        return False
+    healthy = is_healthy(state["endpoint"])
+    idle = int(time.time() - os.path.getmtime(HEARTBEAT_FILE)) if os.path.exists(HEARTBEAT_FILE) else None
+    print(f"[BROWSER SERVER] pid={state['pid']} endpoint={state['endpoint']} headless={state['headless']} "
+          f"healthy={healthy} idle={idle}s")
+    return healthy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Persistent Chromium for UI test sessions")
+    parser.add_argument("command", choices=["start", "serve", "stop", "status"])
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--idle-timeout", type=int, default=DEFAULT_IDLE_TIMEOUT,
+                        help="Seconds without sessions before the server exits")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.port, not args.headed, args.idle_timeout)
+    elif args.command == "start":
+        return 0 if start(args.port, not args.headed, args.idle_timeout) else 1
+    elif args.command == "stop":
+        stop()
+    else:
+        return 0 if status() else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from harness import ROOT_DIR
+from harness.file_lock import FileLock
+
+DEFAULT_LEDGER_PATH = os.path.join(ROOT_DIR, ".cleanup_ledger.jsonl")
+
+# Bookings go first: deleting a room may fail while it still has bookings
+SWEEP_ORDER = ("booking", "room")
+
+RESOURCE_PATHS = {
+    "booking": "booking",
+    "room": "room"
+}
+
+
+def pid_alive(pid):
+    """Whether a process with this PID is running; unknown counts as alive so nothing is swept early"""
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows
+        try:
+            import psutil
+        except ImportError:
+            return True
+        return psutil.pid_exists(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class CleanupLedger:
+    """Append-only on-disk record of every room and booking created against a target
+
+    Each line is a JSON event. Creation and deletion are separate events, so the
+    file survives crashes: a half-written trailing line is ignored on read, and
+    anything created but never marked deleted is picked up by the next sweep.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.environ.get("CLEANUP_LEDGER", DEFAULT_LEDGER_PATH)
+        self.lock_path = f"{self.path}.lock"
+        self._lock = threading.Lock()
+
+    def _append(self, event):
+        line = json.dumps(event, separators=(",", ":")) + "\n"
+        # The file lock keeps appends from other processes out of a concurrent compaction
+        with self._lock, FileLock(self.lock_path):
+            with open(self.path, "a+b") as file:
+                # A run killed mid-write leaves a torn last line; end it so this event gets a line of its own
+                if file.seek(0, os.SEEK_END):
+                    file.seek(-1, os.SEEK_END)
+                    if file.read(1) != b"\n":
+                        line = "\n" + line
+                file.write(line.encode("utf-8"))
+                file.flush()
+                os.fsync(file.fileno())
+
+    def record(self, kind, object_id, base_url):
+        """Record a created object before anything else can go wrong"""
+        if object_id is None:
+            return
+        self._append({"op": "created", "kind": kind, "id": str(object_id), "base_url": base_url,
+                      "pid": os.getpid(), "time": round(time.time(), 3)})
+
+    def mark_deleted(self, kind, object_id, base_url):
+        self._append({"op": "deleted", "kind": kind, "id": str(object_id), "base_url": base_url})
+
+    def discard(self, base_url):
+        """Mark everything pending for a target as deleted without touching it (state was reset)"""
+        for event in self.pending(base_url):
+            self.mark_deleted(event["kind"], event["id"], base_url)
+
+    def _events(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return []
+
+        events = []
+        for line in lines:
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Torn write from an interrupted run
+                continue
+        return events
+
+    def pending(self, base_url=None):
+        """Objects recorded as created and not yet deleted, in creation order"""
+        return [event for event in self._live(self._events()) if base_url is None or event["base_url"] == base_url]
+
+    @staticmethod
+    def _live(events):
+        live = {}
+        for event in events:
+            key = (event.get("base_url"), event.get("kind"), event.get("id"))
+            if event.get("op") == "created":
+                live[key] = event
+            elif event.get("op") == "deleted":
+                live.pop(key, None)
+        return list(live.values())
+
+    def sweepable(self, base_url=None):
+        """Pending objects of this process or of processes that are gone, never of a live run"""
+        return [event for event in self.pending(base_url)
+                if not event.get("pid") or event["pid"] == os.getpid() or not pid_alive(event["pid"])]
+
+    def compact(self):
+        """Rewrite the ledger keeping only pending objects, holding the lock every writer takes
+
+        Does nothing when every event in the file is still pending, so it is cheap to call on every sweep.
+        """
+        with self._lock, FileLock(self.lock_path):
+            events = self._events()
+            pending = self._live(events)
+            if len(pending) == len(events):
+                return
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                for event in pending:
+                    file.write(json.dumps(event, separators=(",", ":")) + "\n")
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.path)
+
+
+class CleanupSweeper:
+    """Reconciles the ledger with the target and bulk-deletes everything still pending"""
+
+    def __init__(self, utils, ledger=None, workers=8):
+        self.utils = utils
+        self.ledger = ledger or utils.ledger
+        self.workers = workers
+
+    def _delete(self, event, headers):
+        url = f"{event['base_url']}/{RESOURCE_PATHS[event['kind']]}/{event['id']}"
+        try:
+            response = self.utils.session.delete(url, headers=headers, timeout=30)
+        except Exception as e:
+            print(f"[CLEANUP] Failed to delete {event['kind']} {event['id']}: {e}")
+            return event, None
+        return event, response.status_code
+
+    def sweep(self):
+        """Delete pending objects for this target concurrently; returns (deleted, failed) counts
+
+        Objects recorded by processes that are still running (another shard, a
+        soak run, a fan-out sibling) are left to their owners. The ledger is
+        compacted on every sweep, so settled created/deleted pairs of clean runs
+        do not pile up.
+        """
+        pending = self.ledger.sweepable(self.utils.base_url)
+        if not pending:
+            self.ledger.compact()
+            return 0, 0
+
+        token = self.utils.get_admin_auth_token(refresh=True)
+        if not token:
+            print(f"[CLEANUP] Skipped sweep of {len(pending)} objects: no admin token")
+            return 0, len(pending)
+        headers = {
+            "Content-Type": "application/json",
+            "Cookie": f"token={token}",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
+
+        deleted = failed = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for kind in SWEEP_ORDER:
+                batch = [event for event in pending if event["kind"] == kind]
+                for event, status in executor.map(lambda event: self._delete(event, headers), batch):
+                    # 404 means it is already gone, which is just as clean
+                    if status in (200, 202, 204, 404):
+                        self.ledger.mark_deleted(event["kind"], event["id"], event["base_url"])
+                        deleted += 1
+                    else:
+                        failed += 1
+
+        self.ledger.compact()
+        print(f"[CLEANUP] Swept {deleted} objects from {self.utils.base_url}, {failed} left in ledger")
+        return deleted, failed
@@ -0,0 +1,209 @@
+"""Run the suites against several configured targets concurrently and compare them
+
+    python -m harness.fanout [--targets production,staging] [-- pytest args]
+
+Every target from the ``targets`` section of test_data.json gets its own
+pytest process (AQA_TARGET=<name>), so sessions, admin tokens, browser
+contexts, UI artifacts, cleanup ledgers and rate limiter wait stats never
+mix, while the rate limiter buckets stay shared with every other run.
+Each process writes a target report (--target-report) with test outcomes,
+durations and HTTP latencies per endpoint; the reports are merged into one
+side-by-side comparison.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+from harness import ROOT_DIR
+from harness.cleanup_ledger import DEFAULT_LEDGER_PATH
+
+DEFAULT_REPORT_ROOT = os.path.join(ROOT_DIR, "test-artifacts", "fanout")
+
+ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_key(method, url):
+    """'POST /booking/{id}' style key: numeric path segments collapsed, query dropped"""
+    path = re.sub(r"^[a-z]+://[^/]+", "", url).split("?")[0].rstrip("/") or "/"
+    return f"{method} {ID_SEGMENT.sub('/{id}', path)}"
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class RequestTimings:
+    """requests response hook collecting latencies per endpoint"""
+
+    def __init__(self):
+        self.latencies = {}
+        self._lock = threading.Lock()
+
+    def record(self, response, *args, **kwargs):
+        key = endpoint_key(response.request.method, response.request.url)
+        with self._lock:
+            self.latencies.setdefault(key, []).append(response.elapsed.total_seconds())
+
+    def summary(self):
+        with self._lock:
+            return {key: {"count": len(values),
+                          "p50": percentile(values, 0.5),
+                          "p95": percentile(values, 0.95),
+                          "mean": sum(values) / len(values)}
+                    for key, values in self.latencies.items()}
+
+
+class TargetReport:
+    """Outcomes and timings of one pytest run against one target"""
+
+    def __init__(self, target, base_url):
+        self.target = target
+        self.base_url = base_url
+        self.tests = {}
+        self.timings = RequestTimings()
+
+    def add(self, report):
+        """Fold a pytest TestReport in: a failed or skipped setup wins over the call phase"""
+        entry = self.tests.setdefault(report.nodeid, {"outcome": "passed", "duration": 0.0})
+        entry["duration"] += report.duration
+        if report.when == "call" and entry["outcome"] == "passed":
+            entry["outcome"] = report.outcome
+        elif report.outcome == "failed":
+            entry["outcome"] = "error" if entry["outcome"] == "passed" else entry["outcome"]
+        elif report.outcome == "skipped":
+            entry["outcome"] = "skipped"
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"target": self.target, "base_url": self.base_url, "tests": self.tests,
+                       "http": self.timings.summary()}, file, indent=2)
+
+
+def load_targets(names=None):
+    from harness.utils import TestUtilities
+    targets = TestUtilities().test_data.get("targets", [])
+    if names:
+        known = {target["name"] for target in targets}
+        unknown = [name for name in names if name not in known]
+        if unknown:
+            raise ValueError(f"Unknown targets: {', '.join(unknown)}, configured: {', '.join(known) or 'none'}")
+        targets = [target for target in targets if target["name"] in names]
+    return targets
+
+
+def run_targets(targets, pytest_args, report_dir):
+    """Start one pytest process per target at once; returns {name: (exit code, report path, log path)}"""
+    os.makedirs(report_dir, exist_ok=True)
+    processes = {}
+    for target in targets:
+        name = target["name"]
+        report_path = os.path.join(report_dir, f"{name}.json")
+        log_path = os.path.join(report_dir, f"{name}.log")
+        # Per-target ledger: one target's sweep never touches another's objects. The limiter state stays
+        # shared, so targets on one host keep one budget; each pytest process counts its own waits
+        ledger = os.environ.get("CLEANUP_LEDGER", DEFAULT_LEDGER_PATH)
+        env = dict(os.environ, AQA_TARGET=name, UI_ARTIFACTS_DIR=os.path.join(report_dir, name),
+                   CLEANUP_LEDGER=f"{ledger}.{name}")
+        # An explicit base URL would point every target at the same place
+        env.pop("AQA_BASE_URL", None)
+        env.pop("RATE_LIMIT_RUN", None)
+        log = open(log_path, "w", encoding="utf-8")
+        command = [sys.executable, "-m", "pytest", *pytest_args, f"--target-report={report_path}"]
+        processes[name] = (subprocess.Popen(command, cwd=ROOT_DIR, env=env, stdout=log, stderr=subprocess.STDOUT),
+                           log, report_path, log_path)
+
+    results = {}
+    for name, (process, log, report_path, log_path) in processes.items():
+        results[name] = (process.wait(), report_path, log_path)
+        log.close()
+    return results
+
+
+def _cell(text, width):
+    return text[:width].ljust(width)
+
+
+def compare(reports, width=18):
+    """Side-by-side text table of test outcomes and HTTP latencies for every target"""
+    names = [report["target"] for report in reports]
+    header = _cell("", 60) + " | " + " | ".join(_cell(name, width) for name in names)
+    lines = [header, "-" * len(header)]
+
+    test_ids = sorted({nodeid for report in reports for nodeid in report["tests"]})
+    for nodeid in test_ids:
+        cells = []
+        for report in reports:
+            entry = report["tests"].get(nodeid)
+            cells.append(_cell(f"{entry['outcome']} {entry['duration']:.2f}s" if entry else "-", width))
+        lines.append(_cell(nodeid.split("::", 1)[-1], 60) + " | " + " | ".join(cells))
+
+    endpoints = sorted({key for report in reports for key in report["http"]})
+    if endpoints:
+        lines += ["", _cell("HTTP latency p50/p95 ms (count)", 60) + " | "
+                  + " | ".join(_cell(name, width) for name in names), "-" * len(header)]
+        for key in endpoints:
+            cells = []
+            fastest = min(report["http"][key]["p50"] for report in reports if key in report["http"])
+            for report in reports:
+                stats = report["http"].get(key)
+                if not stats:
+                    cells.append(_cell("-", width))
+                    continue
+                ratio = f" x{stats['p50'] / fastest:.1f}" if fastest and stats["p50"] > fastest * 1.2 else ""
+                cells.append(_cell(f"{stats['p50'] * 1000:.0f}/{stats['p95'] * 1000:.0f} "
+                                   f"({stats['count']}){ratio}", width))
+            lines.append(_cell(key, 60) + " | " + " | ".join(cells))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    pytest_args = []
+    if "--" in argv:
+        index = argv.index("--")
+        argv, pytest_args = argv[:index], argv[index + 1:]
+
+    parser = argparse.ArgumentParser(description="Run the suites against every configured target concurrently")
+    parser.add_argument("--targets", default=None, help="Comma-separated target names (default: all)")
+    parser.add_argument("--report-dir", default=None, help="Where target reports and logs are written")
+    args = parser.parse_args(argv)
+
+    targets = load_targets(args.targets.split(",") if args.targets else None)
+    if not targets:
+        print("[FANOUT] No targets configured in test_data.json")
+        return 1
+    report_dir = args.report_dir or os.path.join(DEFAULT_REPORT_ROOT, time.strftime("%Y%m%d-%H%M%S"))
+
+    print(f"[FANOUT] Running {', '.join(t['name'] for t in targets)} concurrently, reports in {report_dir}")
+    started = time.perf_counter()
+    results = run_targets(targets, pytest_args, report_dir)
+
+    reports, failed = [], False
+    for name, (exit_code, report_path, log_path) in results.items():
+        failed = failed or exit_code not in (0, 5)
+        try:
+            with open(report_path, "r", encoding="utf-8") as file:
+                reports.append(json.load(file))
+        except (OSError, json.JSONDecodeError):
+            print(f"[FANOUT] {name}: no report (exit code {exit_code}), see {log_path}")
+            continue
+        print(f"[FANOUT] {name}: exit code {exit_code}, log {log_path}")
+
+    if reports:
+        comparison = compare(reports)
+        with open(os.path.join(report_dir, "comparison.txt"), "w", encoding="utf-8") as file:
+            file.write(comparison + "\n")
+        print(comparison)
+    print(f"[FANOUT] Finished in {time.perf_counter() - started:.1f}s")
+    return 1 if failed or len(reports) < len(results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""pytest plugin: shared fixtures, cleanup sweeps and startup timing
+
+Nothing here imports Playwright or the UI helpers at module level. They are
+loaded inside the UI fixtures, so API-only runs never pay for the UI stack.
+"""
+import os
+import sys
+import time
+
+import pytest
+
+_PLUGIN_LOADED = time.perf_counter()
+_timings = {}
+_remote_browser_key = pytest.StashKey[bool]()
+_stand_in_key = pytest.StashKey[object]()
+_target_report_key = pytest.StashKey[object]()
+_resource_usages_key = pytest.StashKey[list]()
+_monitor_key = pytest.StashKey[object]()
+
+UI_FIXTURES = {"ui_playwright", "ui_browser", "ui_page"}
+
+
+def pytest_addoption(parser):
+    parser.addoption("--skip-cleanup-sweep", action="store_true", default=False,
+                     help="Do not bulk-delete objects recorded in the cleanup ledger")
+    parser.addoption("--stand-in", action="store_true", default=False,
+                     help="Run against an in-process stand-in of the booking API instead of base_url")
+    parser.addoption("--stand-in-url", default=None,
+                     help="Run against an already running stand-in (python -m harness.stand_in_server)")
+    parser.addoption("--stand-in-isolation", choices=["test", "module"], default="module",
+                     help="Restore the stand-in state after every test or after every module")
+    parser.addoption("--target-report", default=None,
+                     help="Write test outcomes and HTTP latencies of this run to a JSON file (used by harness.fanout)")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "ui: test drives a browser through Playwright")
+    config.addinivalue_line("markers", "resource_budget(**limits): override UI resource budgets for one test "
+                                       "(cpu_seconds, context_rss_mb, transferred_mb, dom_nodes, js_heap_mb)")
+
+    stand_in_url = config.getoption("--stand-in-url")
+    if config.getoption("--stand-in") and not stand_in_url:
+        from harness.stand_in_server import start_in_thread
+        from harness.utils import TestUtilities
+        server = start_in_thread(TestUtilities().admin_credentials)
+        config.stash[_stand_in_key] = server
+        stand_in_url = server.base_url
+    if stand_in_url:
+        # TestUtilities picks these up, so every helper and fixture targets the stand-in
+        os.environ["AQA_BASE_URL"] = stand_in_url
+        os.environ["AQA_RATE_LIMITS"] = "off"
+
+    if not hasattr(config, "workerinput") and "RATE_LIMIT_RUN" not in os.environ:
+        # xdist workers inherit it, so the whole session counts its rate limiter waits as one run
+        os.environ["RATE_LIMIT_RUN"] = f"pytest-{os.getpid()}"
+
+    if config.getoption("--target-report") and not hasattr(config, "workerinput"):
+        from harness.fanout import TargetReport
+        from harness.utils import TestUtilities
+        test_data = TestUtilities().test_data
+        config.stash[_target_report_key] = TargetReport(os.environ.get("AQA_TARGET", "default"),
+                                                        test_data["base_url"])
+
+
+def pytest_unconfigure(config):
+    limiter = _rate_limiter()
+    if limiter and not hasattr(config, "workerinput"):
+        # Reported already; the shared state file keeps only the buckets
+        limiter.reset_stats()
+
+    server = config.stash.get(_stand_in_key, None)
+    if server:
+        server.shutdown()
+        server.server_close()
+        # The in-process state is gone with the server, so nothing is left to sweep
+        from harness.cleanup_ledger import CleanupLedger
+        CleanupLedger().discard(server.base_url)
+
+
+def _stand_in_control(config):
+    """Control client when the run targets a stand-in, otherwise None"""
+    if not (config.getoption("--stand-in") or config.getoption("--stand-in-url")):
+        return None
+    from harness.stand_in_server import StandInControl
+    return StandInControl(os.environ["AQA_BASE_URL"])
+
+
+def _isolated_stand_in_state(request, scope):
+    control = _stand_in_control(request.config)
+    if not control or request.config.getoption("--stand-in-isolation") != scope:
+        yield
+        return
+    snapshot_id = control.snapshot()
+    yield
+    control.restore(snapshot_id)
+    control.release(snapshot_id)
+
+
+def _sweep_cleanup_ledger(config):
+    """Bulk-delete everything the ledger still lists for the configured target"""
+    # Under pytest-xdist only the controller sweeps, never the workers
+    if config.getoption("--skip-cleanup-sweep") or hasattr(config, "workerinput"):
+        return
+    try:
+        from harness.cleanup_ledger import CleanupSweeper
+        from harness.utils import TestUtilities
+        CleanupSweeper(TestUtilities()).sweep()
+    except Exception as e:
+        print(f"[CLEANUP] Sweep failed: {e}")
+
+
+def _rate_limiter():
+    try:
+        from harness.utils import TestUtilities
+        return TestUtilities().session.limiter
+    except Exception:
+        return None
+
+
+def pytest_sessionstart(session):
+    """Remove objects leaked by previous crashed or interrupted runs"""
+    _timings["startup"] = time.perf_counter() - _PLUGIN_LOADED
+    limiter = _rate_limiter()
+    if limiter and not hasattr(session.config, "workerinput"):
+        limiter.reset_stats()
+    sweep_started = time.perf_counter()
+    _sweep_cleanup_ledger(session.config)
+    _timings["initial sweep"] = time.perf_counter() - sweep_started
+
+
+def pytest_collection(session):
+    _timings["collection_started"] = time.perf_counter()
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark tests that request a UI fixture so API smoke runs can use -m 'not ui'"""
+    for item in items:
+        if UI_FIXTURES.intersection(getattr(item, "fixturenames", ())):
+            item.add_marker(pytest.mark.ui)
+
+
+def pytest_collection_finish(session):
+    _timings["collection"] = time.perf_counter() - _timings.pop("collection_started", time.perf_counter())
+    _timings["modules"] = len({item.module.__name__ for item in session.items if getattr(item, "module", None)})
+    _timings["collection imports"] = _lazy_imports()
+
+
+def _lazy_imports():
+    """Which of the heavy UI dependencies are loaded right now"""
+    return {"UI helpers": "harness.ui" in sys.modules, "playwright": "playwright" in sys.modules}
+
+
+def pytest_sessionfinish(session, exitstatus):
+    _sweep_cleanup_ledger(session.config)
+    target_report = session.config.stash.get(_target_report_key, None)
+    if target_report:
+        target_report.write(session.config.getoption("--target-report"))
+
+
+def pytest_terminal_summary(terminalreporter):
+    if "collection" not in _timings:
+        return
+    terminalreporter.write_sep("-", "harness startup")
+    terminalreporter.write_line(
+        f"plugin to session start {_timings['startup']:.2f}s, initial cleanup sweep "
+        f"{_timings['initial sweep']:.2f}s, collection {_timings['collection']:.2f}s "
+        f"({_timings['modules']} modules)"
+    )
+    # Collection is what an API-only run pays for; by the end of the run UI tests may have loaded them
+    for moment, imported in (("collection", _timings["collection imports"]), ("session end", _lazy_imports())):
+        terminalreporter.write_line(f"imported by {moment}: " + ", ".join(
+            f"{name} {'yes' if loaded else 'no'}" for name, loaded in imported.items()))
+
+    limiter = _rate_limiter()
+    if limiter:
+        waits = limiter.wait_stats()
+        terminalreporter.write_sep("-", "rate limiter waits")
+        if not waits:
+            terminalreporter.write_line("no request had to wait for the rate limiter")
+        for bucket, stats in sorted(waits.items(), key=lambda item: -item[1]["seconds"]):
+            terminalreporter.write_line(f"{bucket}: {stats['count']} waits, {stats['seconds']:.2f}s total")
+
+    usages = terminalreporter.config.stash.get(_resource_usages_key, [])
+    if usages:
+        from harness.ui.monitor import recommend_contexts
+        terminalreporter.write_sep("-", "ui resource usage")
+        for usage in usages:
+            terminalreporter.write_line(f"{usage.test_name}: {usage.describe()}")
+        contexts, reason = recommend_contexts(usages)
+        if contexts:
+            terminalreporter.write_line(f"capacity: {contexts} concurrent browser contexts fit this machine ({reason})")
+        else:
+            terminalreporter.write_line(f"capacity: no recommendation ({reason})")
+
+
+@pytest.hookimpl(hookwrapper=True, tryfirst=True)
+def pytest_runtest_makereport(item, call):
+    """Keep each phase report on the item so fixtures can tell whether the test failed"""
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+    target_report = item.config.stash.get(_target_report_key, None)
+    if target_report:
+        target_report.add(report)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Fail a passing UI test whose browser resource usage exceeded its budget"""
+    result = yield
+    monitor = item.stash.get(_monitor_key, None)
+    if monitor:
+        from harness.ui.constants import UIConstants
+        marker = item.get_closest_marker("resource_budget")
+        budgets = dict(UIConstants.RESOURCE_BUDGETS, **(marker.kwargs if marker else {}))
+        violations = monitor.stop().over_budget(budgets)
+        if violations:
+            pytest.fail("Resource budget exceeded: " + "; ".join(violations), pytrace=False)
+    return result
+
+
+@pytest.fixture(scope="module", autouse=True)
+def stand_in_module_state(request):
+    """With --stand-in-isolation=module, reset the stand-in to its pre-module state in one call"""
+    yield from _isolated_stand_in_state(request, "module")
+
+
+@pytest.fixture(autouse=True)
+def stand_in_test_state(request):
+    """With --stand-in-isolation=test, reset the stand-in to its pre-test state in one call"""
+    yield from _isolated_stand_in_state(request, "test")
+
+
+@pytest.fixture(scope="session")
+def utils(pytestconfig):
+    """Shared TestUtilities: one HTTP session and one admin login per run"""
+    from harness.utils import TestUtilities
+    utils = TestUtilities()
+    target_report = pytestconfig.stash.get(_target_report_key, None)
+    if target_report:
+        utils.session.hooks["response"].append(target_report.timings.record)
+    return utils
+
+
+@pytest.fixture(scope="session")
+def ui_playwright(pytestconfig):
+    if _stand_in_control(pytestconfig):
+        pytest.skip("The stand-in serves only the booking API, not the UI")
+    from playwright.sync_api import sync_playwright
+    playwright = sync_playwright().start()
+    yield playwright
+    playwright.stop()
+
+
+@pytest.fixture(scope="session")
+def ui_browser(ui_playwright, pytestconfig):
+    """Warm browser from the browser server when available, otherwise a local launch"""
+    from harness.ui.browser import launch_browser
+    browser, remote = launch_browser(ui_playwright)
+    pytestconfig.stash[_remote_browser_key] = remote
+    yield browser
+    # A shared server browser is left running; stopping playwright disconnects from it
+    if not remote:
+        browser.close()
+
+
+@pytest.fixture
+def ui_page(ui_browser, pytestconfig, request):
+    """Page in a fresh browser context with failure-only artifact capture and resource monitoring"""
+    from harness import browser_server
+    from harness.ui.capture import FailureCapture
+    from harness.ui.constants import UIConstants
+
+    remote = pytestconfig.stash.get(_remote_browser_key, False)
+    if remote:
+        browser_server.touch()
+
+    context = ui_browser.new_context()
+    page = context.new_page()
+    capture = FailureCapture(context, page, request.node.nodeid)
+    capture.start()
+
+    monitor = None
+    if UIConstants.RESOURCE_MONITOR:
+        from harness.ui.monitor import ContextMonitor
+        # A local browser runs under this process, a warm one under the browser server
+        state = browser_server.read_state() if remote else None
+        roots = {state["pid"]} if state else {os.getpid()}
+        monitor = ContextMonitor(context, page, request.node.nodeid, roots)
+        monitor.start()
+        request.node.stash[_monitor_key] = monitor
+
+    yield page
+
+    # Page metrics and artifacts are taken before the context is closed
+    if monitor:
+        pytestconfig.stash.setdefault(_resource_usages_key, []).append(monitor.stop())
+    report = getattr(request.node, "rep_call", None)
+    capture.finalize(failed=report is None or report.failed)
+    try:
+        context.close()
+    except Exception as e:
+        print(f"[WARNING] Failed to close browser context: {e}")
@@ -0,0 +1,88 @@
+"""Process table, descendant lookup and machine capacity, via psutil when installed or /proc otherwise"""
+import os
+
+MB = 1024 * 1024
+
+
+class ProcessInfo:
+    """Parent PID, resident memory and consumed CPU time of one process"""
+
+    __slots__ = ("ppid", "rss", "cpu_seconds")
+
+    def __init__(self, ppid, rss, cpu_seconds):
+        self.ppid = ppid
+        self.rss = rss
+        self.cpu_seconds = cpu_seconds
+
+
+def _proc_processes():
+    """{pid: ProcessInfo} from /proc, or None where /proc is unavailable"""
+    if not os.path.isdir("/proc/self"):
+        return None
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    ticks = os.sysconf("SC_CLK_TCK")
+    processes = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as file:
+                # The command name may contain spaces, fields resume after its closing parenthesis
+                fields = file.read().rsplit(")", 1)[1].split()
+            with open(f"/proc/{entry}/statm", "r") as file:
+                rss_pages = int(file.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / ticks
+        processes[int(entry)] = ProcessInfo(int(fields[1]), rss_pages * page_size, cpu_seconds)
+    return processes
+
+
+def process_table():
+    """{pid: ProcessInfo} for every visible process, or None when neither psutil nor /proc is available"""
+    try:
+        import psutil
+    except ImportError:
+        return _proc_processes()
+    processes = {}
+    for process in psutil.process_iter(["ppid", "memory_info", "cpu_times"]):
+        memory, cpu = process.info["memory_info"], process.info["cpu_times"]
+        processes[process.pid] = ProcessInfo(process.info["ppid"], memory.rss if memory else 0,
+                                             cpu.user + cpu.system if cpu else 0.0)
+    return processes
+
+
+def descendants(processes, roots):
+    """PIDs of every process below the given roots"""
+    children = {}
+    for pid, info in processes.items():
+        children.setdefault(info.ppid, []).append(pid)
+    found, stack = set(), list(roots)
+    while stack:
+        for child in children.get(stack.pop(), []):
+            if child not in found:
+                found.add(child)
+                stack.append(child)
+    return found
+
+
+def process_tree(processes, roots):
+    """PIDs of the roots that still exist plus all their descendants"""
+    return descendants(processes, roots) | (set(roots) & set(processes))
+
+
+def available_memory():
+    """Bytes of memory available to new processes, or None when unknown"""
+    try:
+        import psutil
+        return psutil.virtual_memory().available
+    except ImportError:
+        pass
+    try:
+        with open("/proc/meminfo", "r") as file:
+            for line in file:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+from harness import ROOT_DIR
+from harness.file_lock import FileLock
+
+DEFAULT_STATE_PATH = os.path.join(ROOT_DIR, ".rate_limiter.json")
+
+
+class RateLimiter:
+    """Token buckets per target endpoint, stored in a file shared by all threads and processes
+
+    ``budgets`` maps a URL path prefix to ``{"rate": tokens_per_second, "burst": size}``;
+    the longest matching prefix wins and ``"default"`` covers everything else.
+    Each bucket is keyed by host and prefix, so different targets never share budget.
+    Waiting time is counted per run (``RATE_LIMIT_RUN``, one per pytest session),
+    so runs sharing the buckets never reset or report each other's waits.
+    """
+
+    def __init__(self, budgets, state_path=None, run=None):
+        self.budgets = budgets
+        self.prefixes = sorted((prefix for prefix in budgets if prefix != "default"), key=len, reverse=True)
+        self.state_path = state_path or os.environ.get("RATE_LIMIT_STATE", DEFAULT_STATE_PATH)
+        self.run = run or os.environ.get("RATE_LIMIT_RUN", f"pid-{os.getpid()}")
+        self.lock_path = f"{self.state_path}.lock"
+        self._thread_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, test_data):
+        """Limiter for the configured budgets; AQA_RATE_LIMITS=off disables it (e.g. for a local stand-in)"""
+        if os.environ.get("AQA_RATE_LIMITS", "").lower() == "off":
+            return None
+        budgets = test_data.get("rate_limits")
+        return cls(budgets) if budgets else None
+
+    def _bucket(self, url):
+        parsed = urlparse(url)
+        path = parsed.path or "/"
+        for prefix in self.prefixes:
+            if path.startswith(prefix):
+                return f"{parsed.netloc}{prefix}", self.budgets[prefix]
+        return f"{parsed.netloc}/*", self.budgets.get("default")
+
+    def _read(self):
+        try:
+            with open(self.state_path, "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"buckets": {}, "waits": {}}
+
+    def _write(self, state):
+        temp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(state, file)
+        os.replace(temp_path, self.state_path)
+
+    def acquire(self, url):
+        """Block until the endpoint's bucket has a token; returns seconds spent waiting"""
+        key, budget = self._bucket(url)
+        if not budget:
+            return 0.0
+
+        rate, burst = float(budget["rate"]), float(budget.get("burst", budget["rate"]))
+        waited = 0.0
+        while True:
+            with self._thread_lock, FileLock(self.lock_path):
+                state = self._read()
+                now = time.time()
+                bucket = state["buckets"].get(key, {"tokens": burst, "updated": now})
+                tokens = min(burst, bucket["tokens"] + max(0.0, now - bucket["updated"]) * rate)
+
+                if tokens >= 1:
+                    state["buckets"][key] = {"tokens": tokens - 1, "updated": now}
+                    if waited:
+                        stats = state["waits"].setdefault(self.run, {}).setdefault(key, {"count": 0, "seconds": 0.0})
+                        stats["count"] += 1
+                        stats["seconds"] += waited
+                    self._write(state)
+                    return waited
+
+                state["buckets"][key] = {"tokens": tokens, "updated": now}
+                self._write(state)
+                delay = (1 - tokens) / rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def wait_stats(self):
+        """Waiting time per bucket accumulated by every process of this run since the last reset"""
+        with FileLock(self.lock_path):
+            return self._read().get("waits", {}).get(self.run, {})
+
+    def reset_stats(self):
+        """Forget this run's waits; the buckets and other runs' waits are left alone"""
+        with self._thread_lock, FileLock(self.lock_path):
+            state = self._read()
+            if state.get("waits", {}).pop(self.run, None) is not None:
+                self._write(state)
+
+
+class RateLimitedSession(requests.Session):
+    """requests.Session that takes a token from the shared limiter before every request"""
+
+    def __init__(self, limiter=None):
+        super().__init__()
+        self.limiter = limiter
+
+    def request(self, method, url, *args, **kwargs):
+        if self.limiter:
+            self.limiter.acquire(url)
+        return super().request(method, url, *args, **kwargs)
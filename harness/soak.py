@@ -0,0 +1,355 @@
+"""Soak runner: loops booking lifecycles for a set duration and tracks resource growth
+
+    python -m harness.soak --duration 3600 [--ui] [--interval 60]
+
+Every iteration runs the API lifecycle (room, booking, lookup, deletes); with
+--ui every ``ui_every``-th iteration also books through a fresh browser
+context. Samples of the harness's own Python heap (tracemalloc), RSS, open
+file descriptors, pooled HTTP connections and browser process RSS are taken
+periodically. After the warm-up, growth against the first sample and its
+trend per 1000 iterations are checked against the ``soak.limits`` section of
+test_data.json; the exit code is 1 when a limit or the error rate is exceeded.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+from harness import browser_server
+from harness.process_stats import MB, process_table, process_tree
+from harness.utils import ApiError
+
+DEFAULT_SOAK_CONFIG = {
+    "duration_seconds": 3600,
+    "sample_interval_seconds": 60,
+    "warmup_iterations": 20,
+    "ui_every": 10,
+    "max_error_rate": 0.05,
+    "limits": {
+        "python_heap_mb": 20,
+        "rss_mb": 150,
+        "open_fds": 16,
+        "pool_connections": 16,
+        "browser_processes": 2,
+        "browser_rss_mb": 300
+    }
+}
+
+# Allocations of tracemalloc, the import system and the sampler itself are noise in the growth report
+TRACE_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>")
+]
+
+
+def open_fd_count():
+    for path in ("/proc/self/fd", "/dev/fd"):
+        if os.path.isdir(path):
+            return len(os.listdir(path))
+    try:
+        import psutil
+    except ImportError:
+        return None
+    process = psutil.Process()
+    return process.num_handles() if os.name == "nt" else process.num_fds()
+
+
+def pooled_connections(session):
+    """(pools, idle connections kept) across every adapter mounted on a requests session"""
+    pools = connections = 0
+    for adapter in session.adapters.values():
+        manager = getattr(adapter, "poolmanager", None)
+        if manager is None:
+            continue
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is None:
+                continue
+            pools += 1
+            connections += sum(1 for connection in list(pool.pool.queue) if connection is not None)
+    return pools, connections
+
+
+def trend(points):
+    """Least-squares slope of (x, y) points, None with fewer than two distinct x values"""
+    if len({x for x, _ in points}) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    return numerator / denominator
+
+
+class ResourceSampler:
+    """Samples the harness process, its HTTP pools and the browser processes it drives"""
+
+    def __init__(self, session, top=10):
+        self.session = session
+        self.top = top
+        self.baseline_snapshot = None
+        self.browser_roots = set()
+        self._tracing = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+
+    def stop(self):
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def sample(self, iteration, elapsed):
+        processes = process_table()
+        pools, connections = pooled_connections(self.session)
+        sample = {
+            "iteration": iteration,
+            "elapsed": round(elapsed, 1),
+            "python_heap_mb": tracemalloc.get_traced_memory()[0] / MB,
+            "rss_mb": None,
+            "open_fds": open_fd_count(),
+            "connection_pools": pools,
+            "pool_connections": connections,
+            "browser_processes": None,
+            "browser_rss_mb": None
+        }
+        if processes is not None:
+            own = processes.get(os.getpid())
+            sample["rss_mb"] = own.rss / MB if own else None
+            # Local browsers and the Playwright driver are our descendants,
+            # a warm browser server is a separate tree rooted at its own PID
+            browser = process_tree(processes, {os.getpid()} | self.browser_roots) - {os.getpid()}
+            sample["browser_processes"] = len(browser)
+            sample["browser_rss_mb"] = sum(processes[pid].rss for pid in browser) / MB
+        return sample
+
+    def mark_baseline(self):
+        self.baseline_snapshot = tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+
+    def heap_growth(self):
+        """Allocation sites that grew the most since the baseline snapshot"""
+        if self.baseline_snapshot is None:
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces(TRACE_FILTERS)
+        stats = snapshot.compare_to(self.baseline_snapshot, "lineno")
+        return [stat for stat in stats if stat.size_diff > 0][:self.top]
+
+
+class SoakReport:
+    """Samples of a soak run with growth and trend checks against configured limits"""
+
+    METRICS = ("python_heap_mb", "rss_mb", "open_fds", "connection_pools", "pool_connections",
+               "browser_processes", "browser_rss_mb")
+
+    def __init__(self, samples, iterations, errors, warmup_iterations, limits, max_error_rate, heap_growth=None):
+        self.samples = samples
+        self.iterations = iterations
+        self.errors = errors
+        self.warmup_iterations = warmup_iterations
+        self.limits = limits
+        self.max_error_rate = max_error_rate
+        self.heap_growth = heap_growth or []
+
+    @property
+    def measured(self):
+        """Samples taken after the warm-up"""
+        return [sample for sample in self.samples if sample["iteration"] >= self.warmup_iterations]
+
+    def growth(self, metric):
+        values = [sample[metric] for sample in self.measured if sample[metric] is not None]
+        return values[-1] - values[0] if len(values) > 1 else None
+
+    def trend_per_1000(self, metric):
+        slope = trend([(sample["iteration"], sample[metric]) for sample in self.measured
+                       if sample[metric] is not None])
+        return None if slope is None else slope * 1000
+
+    @property
+    def error_rate(self):
+        return len(self.errors) / self.iterations if self.iterations else 0.0
+
+    @property
+    def failures(self):
+        failures = []
+        for metric, limit in self.limits.items():
+            growth = self.growth(metric)
+            if growth is not None and growth > limit:
+                failures.append(f"{metric} grew by {growth:.1f}, limit {limit}")
+        if self.error_rate > self.max_error_rate:
+            failures.append(f"error rate {self.error_rate:.1%}, limit {self.max_error_rate:.1%}")
+        return failures
+
+    def summary(self):
+        elapsed = self.samples[-1]["elapsed"] if self.samples else 0
+        lines = [f"{self.iterations} iterations in {elapsed:.0f}s, {len(self.errors)} errors, "
+                 f"{len(self.samples)} samples ({len(self.measured)} after warm-up)"]
+        for metric in self.METRICS:
+            growth, slope = self.growth(metric), self.trend_per_1000(metric)
+            if growth is None:
+                continue
+            limit = self.limits.get(metric)
+            lines.append(f"  {metric}: {self.measured[-1][metric]:.1f} now, growth {growth:+.1f}"
+                         f"{f' (limit {limit})' if limit is not None else ''}"
+                         f"{f', trend {slope:+.2f}/1000 iterations' if slope is not None else ''}")
+        if self.heap_growth:
+            lines.append("  top heap growth since warm-up:")
+            for stat in self.heap_growth:
+                frame = stat.traceback[0]
+                lines.append(f"    {frame.filename}:{frame.lineno}: {stat.size_diff / 1024:+.1f} KiB "
+                             f"({stat.count_diff:+d} blocks)")
+        for error in self.errors[:5]:
+            lines.append(f"  error at iteration {error[0]}: {error[1]}")
+        for failure in self.failures:
+            lines.append(f"  [FAIL] {failure}")
+        return "\n".join(lines)
+
+
+AUTH_FAILURE_STATUSES = (401, 403)
+
+
+def api_lifecycle(utils):
+    """Run one API lifecycle; an expired admin token is refreshed and the lifecycle retried once"""
+    try:
+        _api_lifecycle(utils)
+    except ApiError as e:
+        if e.status not in AUTH_FAILURE_STATUSES:
+            raise
+        print(f"[SOAK] Admin token rejected (status {e.status}), logging in again")
+        utils.get_admin_auth_token(refresh=True)
+        _api_lifecycle(utils)
+
+
+def _api_lifecycle(utils):
+    """Create a room and a booking, read the booking back and delete both"""
+    room_id = utils.create_test_room()
+    try:
+        booking_id = utils.create_test_booking(room_id)
+        if not utils.get_booking_details(booking_id):
+            raise RuntimeError(f"Booking {booking_id} not found after creation")
+        headers = {"Cookie": f"token={utils.get_admin_auth_token()}"}
+        if not utils.delete_booking(f"{utils.base_url}/booking", booking_id, headers):
+            raise RuntimeError(f"Failed to delete booking {booking_id}")
+    finally:
+        utils.delete_test_room(room_id)
+
+
+def ui_booking(browser, utils):
+    """Book through the home page in a fresh browser context, as the UI tests do"""
+    from harness.ui.constants import UIConstants, UIHelpers, UISelectors
+    from harness.ui.network import submit_booking
+
+    context = browser.new_context()
+    try:
+        page = context.new_page()
+        page.goto(utils.test_data["base_url"])
+        page.wait_for_load_state("domcontentloaded")
+        UIHelpers.try_click_element(page, UISelectors.BOOKING_BUTTON_SELECTORS)
+        page.wait_for_timeout(UIConstants.TIMEOUT_INTERACTION)
+
+        booking_data = utils.test_data["valid_booking_data"]
+        for field in ("firstname", "lastname", "email", "phone"):
+            element = UIHelpers.find_element_by_selectors(page, UISelectors.FORM_SELECTORS[field])
+            if element:
+                element.fill(booking_data[field])
+
+        def record(booking_id):
+            utils.ledger.record("booking", booking_id, utils.base_url)
+
+        outcome = submit_booking(
+            page, lambda: UIHelpers.try_click_element(page, UISelectors.SUBMIT_BUTTON_SELECTORS), on_created=record)
+        if outcome.submitted and outcome.status >= 500:
+            raise RuntimeError(f"Booking submission failed: {outcome}")
+    finally:
+        context.close()
+
+
+class SoakRunner:
+    """Loops the booking lifecycles and samples resources until the duration is up"""
+
+    def __init__(self, utils, duration=None, interval=None, ui=False, config=None):
+        config = dict(DEFAULT_SOAK_CONFIG, **(config or utils.test_data.get("soak", {})))
+        self.utils = utils
+        self.duration = duration if duration is not None else config["duration_seconds"]
+        self.interval = interval if interval is not None else config["sample_interval_seconds"]
+        self.warmup_iterations = config["warmup_iterations"]
+        self.ui_every = config["ui_every"]
+        self.max_error_rate = config["max_error_rate"]
+        self.limits = dict(DEFAULT_SOAK_CONFIG["limits"], **config.get("limits", {}))
+        self.ui = ui
+        self.sampler = ResourceSampler(utils.session)
+
+    def run(self, max_iterations=None, progress=print):
+        playwright = browser = None
+        if self.ui:
+            from playwright.sync_api import sync_playwright
+            from harness.ui.browser import launch_browser
+            playwright = sync_playwright().start()
+            browser, remote = launch_browser(playwright)
+            if remote:
+                state = browser_server.read_state() or {}
+                self.sampler.browser_roots = {state["pid"]} if state.get("pid") else set()
+
+        self.sampler.start()
+        samples, errors = [], []
+        started = time.monotonic()
+        next_sample = started
+        iteration = 0
+        try:
+            while time.monotonic() - started < self.duration:
+                if max_iterations is not None and iteration >= max_iterations:
+                    break
+                try:
+                    api_lifecycle(self.utils)
+                    if browser and iteration % self.ui_every == 0:
+                        ui_booking(browser, self.utils)
+                except Exception as e:
+                    errors.append((iteration, f"{type(e).__name__}: {e}"))
+                iteration += 1
+
+                if iteration == self.warmup_iterations:
+                    self.sampler.mark_baseline()
+                    next_sample = time.monotonic()
+                if time.monotonic() >= next_sample:
+                    sample = self.sampler.sample(iteration, time.monotonic() - started)
+                    samples.append(sample)
+                    next_sample += self.interval
+                    if progress:
+                        progress(f"[SOAK] iteration {iteration}: heap {sample['python_heap_mb']:.1f} MB, "
+                                 f"fds {sample['open_fds']}, pooled {sample['pool_connections']}, "
+                                 f"browser {sample['browser_processes']} processes")
+
+            samples.append(self.sampler.sample(iteration, time.monotonic() - started))
+            heap_growth = self.sampler.heap_growth()
+        finally:
+            self.sampler.stop()
+            if browser:
+                browser.close()
+            if playwright:
+                playwright.stop()
+
+        return SoakReport(samples, iteration, errors, self.warmup_iterations, self.limits,
+                          self.max_error_rate, heap_growth)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak the booking lifecycles and track resource growth")
+    parser.add_argument("--duration", type=float, default=None, help="Seconds to run (default from test_data.json)")
+    parser.add_argument("--interval", type=float, default=None, help="Seconds between resource samples")
+    parser.add_argument("--iterations", type=int, default=None, help="Stop after this many iterations")
+    parser.add_argument("--ui", action="store_true", help="Also book through the browser every ui_every iterations")
+    args = parser.parse_args(argv)
+
+    from harness.utils import TestUtilities
+    report = SoakRunner(TestUtilities(), args.duration, args.interval, args.ui).run(args.iterations)
+    print(report.summary())
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,366 @@
+"""Local stand-in for the booking platform API
+
+    python -m harness.stand_in_server [--port 8765]
+
+Implements the endpoints the harness uses (auth, rooms, bookings) with
+validation modelled on the real platform, plus control endpoints for test
+isolation:
+
+    POST /__control/snapshot         -> {"snapshot": <id>}
+    POST /__control/restore/<id>     -> state as it was when the snapshot was taken
+    POST /__control/release/<id>     -> forget a snapshot
+    GET  /__control/health
+
+State lives in a versioned store with an undo journal: a snapshot is just a
+journal position and a restore rolls back only the changes made since then,
+so its cost does not grow with the size of the dataset.
+"""
+import argparse
+import itertools
+import json
+import re
+import secrets
+import threading
+import urllib.request
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from harness.test_data import booking_field_limits
+
+MISSING = object()
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+$")
+
+
+class VersionedStore:
+    """Tables of records with an undo journal for O(changes) snapshot restore"""
+
+    def __init__(self):
+        self.tables = {"room": {}, "booking": {}}
+        self.counters = {"room": 0, "booking": 0}
+        self.journal = []
+        self.snapshots = {}
+        self._snapshot_ids = itertools.count(1)
+        self.lock = threading.RLock()
+
+    def _journal(self, entry):
+        # Without open snapshots nothing can be rolled back, so nothing is kept
+        if self.snapshots:
+            self.journal.append(entry)
+
+    def next_id(self, table):
+        with self.lock:
+            self._journal(("counter", table, self.counters[table]))
+            self.counters[table] += 1
+            return self.counters[table]
+
+    def put(self, table, key, record):
+        with self.lock:
+            self._journal(("record", table, key, self.tables[table].get(key, MISSING)))
+            self.tables[table][key] = record
+
+    def delete(self, table, key):
+        with self.lock:
+            if key not in self.tables[table]:
+                return False
+            self._journal(("record", table, key, self.tables[table][key]))
+            del self.tables[table][key]
+            return True
+
+    def get(self, table, key):
+        with self.lock:
+            return self.tables[table].get(key)
+
+    def values(self, table):
+        with self.lock:
+            return list(self.tables[table].values())
+
+    def snapshot(self):
+        """Remember the current journal position; returns the snapshot ID"""
+        with self.lock:
+            snapshot_id = next(self._snapshot_ids)
+            self.snapshots[snapshot_id] = len(self.journal)
+            return snapshot_id
+
+    def restore(self, snapshot_id):
+        """Undo every change made after the snapshot; later snapshots become invalid"""
+        with self.lock:
+            position = self.snapshots.get(snapshot_id)
+            if position is None:
+                return False
+            while len(self.journal) > position:
+                entry = self.journal.pop()
+                if entry[0] == "counter":
+                    _, table, previous = entry
+                    self.counters[table] = previous
+                else:
+                    _, table, key, previous = entry
+                    if previous is MISSING:
+                        self.tables[table].pop(key, None)
+                    else:
+                        self.tables[table][key] = previous
+            self.snapshots = {sid: pos for sid, pos in self.snapshots.items() if pos <= position}
+            # Without open snapshots nothing can roll back past here, so the journal can go
+            if not self.snapshots:
+                self.journal.clear()
+            return True
+
+    def release(self, snapshot_id):
+        """Forget a snapshot that will not be restored"""
+        with self.lock:
+            self.snapshots.pop(snapshot_id, None)
+            if not self.snapshots:
+                self.journal.clear()
+
+
+def validate_booking(payload, store, field_limits=None, email_pattern=EMAIL_PATTERN):
+    """Return (status, errors) for a booking payload; (201, []) when it is valid"""
+    if not isinstance(payload, dict):
+        return 400, ["Request body must be a JSON object"]
+
+    errors = []
+    for field, (low, high) in (field_limits or booking_field_limits).items():
+        value = payload.get(field)
+        if value is None:
+            errors.append(f"{field} must not be null")
+        elif not isinstance(value, str):
+            errors.append(f"{field} must be a string")
+        elif not value.strip():
+            errors.append(f"{field} should not be blank")
+        elif not low <= len(value) <= high:
+            errors.append(f"{field} size must be between {low} and {high}")
+
+    email = payload.get("email")
+    if not isinstance(email, str) or not email.strip():
+        errors.append("email should not be blank")
+    elif not email_pattern.match(email) or len(email.split("@")[0]) > 64 or len(email) > 254:
+        errors.append("email must be a well-formed email address")
+
+    room_id = payload.get("roomid")
+    if not isinstance(room_id, int) or isinstance(room_id, bool):
+        errors.append("roomid must be a number")
+    elif store.get("room", room_id) is None:
+        errors.append("roomid must reference an existing room")
+
+    dates = payload.get("bookingdates")
+    checkin = checkout = None
+    if not isinstance(dates, dict):
+        errors.append("bookingdates must not be null")
+    else:
+        try:
+            checkin = date.fromisoformat(dates.get("checkin"))
+            checkout = date.fromisoformat(dates.get("checkout"))
+        except (TypeError, ValueError):
+            errors.append("bookingdates must be valid ISO dates")
+        else:
+            if checkout <= checkin:
+                errors.append("checkout must be after checkin")
+
+    if errors:
+        return 400, errors
+
+    for booking in store.values("booking"):
+        if booking["roomid"] != room_id:
+            continue
+        booked_in = date.fromisoformat(booking["bookingdates"]["checkin"])
+        booked_out = date.fromisoformat(booking["bookingdates"]["checkout"])
+        if checkin < booked_out and booked_in < checkout:
+            return 409, ["The room dates are either invalid or are already booked for one or more of the dates"]
+    return 201, []
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Routes requests to the booking platform emulation"""
+
+    server_version = "BookingStandIn/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def store(self):
+        return self.server.store
+
+    def _send(self, status, body=None, headers=None):
+        data = b"" if body is None else json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        try:
+            return json.loads(self.rfile.read(length))
+        except json.JSONDecodeError:
+            return MISSING
+
+    def _authorized(self):
+        cookies = self.headers.get("Cookie", "")
+        return any(part.strip() == f"token={self.server.token}" for part in cookies.split(";"))
+
+    def _route(self):
+        parsed = urlparse(self.path)
+        parts = [part for part in parsed.path.split("/") if part]
+        return parts, parse_qs(parsed.query)
+
+    def do_GET(self):
+        parts, query = self._route()
+        if parts == ["__control", "health"]:
+            return self._send(200, {"status": "ok"})
+        if parts == ["room"]:
+            return self._send(200, {"rooms": self.store.values("room")})
+        if len(parts) == 2 and parts[0] == "room" and parts[1].isdigit():
+            room = self.store.get("room", int(parts[1]))
+            return self._send(200, room) if room else self._send(404)
+        if parts == ["booking"]:
+            if not self._authorized():
+                return self._send(403)
+            bookings = self.store.values("booking")
+            if "roomid" in query:
+                bookings = [b for b in bookings if str(b["roomid"]) == query["roomid"][0]]
+            return self._send(200, {"bookings": bookings})
+        if len(parts) == 2 and parts[0] == "booking" and parts[1].isdigit():
+            if not self._authorized():
+                return self._send(403)
+            booking = self.store.get("booking", int(parts[1]))
+            return self._send(200, booking) if booking else self._send(404)
+        self._send(404)
+
+    def do_POST(self):
+        parts, _ = self._route()
+        body = self._body()
+        if body is MISSING:
+            return self._send(400, {"errors": ["Malformed JSON request"]})
+
+        if parts == ["__control", "snapshot"]:
+            return self._send(200, {"snapshot": self.store.snapshot()})
+        if len(parts) == 3 and parts[:2] == ["__control", "restore"] and parts[2].isdigit():
+            restored = self.store.restore(int(parts[2]))
+            return self._send(200, {"restored": True}) if restored else self._send(404)
+        if len(parts) == 3 and parts[:2] == ["__control", "release"] and parts[2].isdigit():
+            self.store.release(int(parts[2]))
+            return self._send(200, {"released": True})
+
+        if parts == ["auth", "login"]:
+            body = body or {}
+            credentials = self.server.credentials
+            if body.get("username") == credentials["username"] and body.get("password") == credentials["password"]:
+                return self._send(200, {"token": self.server.token},
+                                  {"Set-Cookie": f"token={self.server.token}; Path=/"})
+            return self._send(401, {"error": "Invalid credentials"})
+
+        if parts == ["room"]:
+            if not self._authorized():
+                return self._send(403)
+            if not isinstance(body, dict) or not body.get("roomName"):
+                return self._send(400, {"errors": ["roomName must be set"]})
+            room_id = self.store.next_id("room")
+            room = dict(body, roomid=room_id)
+            self.store.put("room", room_id, room)
+            return self._send(201, room)
+
+        if parts == ["booking"]:
+            status, errors = validate_booking(body, self.store, self.server.field_limits, self.server.email_pattern)
+            if errors:
+                return self._send(status, {"errors": errors})
+            booking_id = self.store.next_id("booking")
+            booking = {key: body[key] for key in ("roomid", "firstname", "lastname", "email", "phone")}
+            booking.update(bookingid=booking_id, bookingdates=body["bookingdates"], depositpaid=False)
+            self.store.put("booking", booking_id, booking)
+            return self._send(201, {"bookingid": booking_id, "booking": booking})
+
+        self._send(404)
+
+    def do_DELETE(self):
+        parts, _ = self._route()
+        if len(parts) == 2 and parts[0] in ("room", "booking") and parts[1].isdigit():
+            if not self._authorized():
+                return self._send(403)
+            table, key = parts[0], int(parts[1])
+            if table == "room":
+                for booking in self.store.values("booking"):
+                    if booking["roomid"] == key:
+                        self.store.delete("booking", booking["bookingid"])
+            return self._send(202) if self.store.delete(table, key) else self._send(404)
+        self._send(404)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """HTTP server holding one VersionedStore
+
+    ``field_limits`` and ``email_pattern`` are the booking validation rules; a
+    test can loosen them to plant a known validation gap.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, credentials):
+        super().__init__(address, StandInHandler)
+        self.store = VersionedStore()
+        self.credentials = credentials
+        self.token = secrets.token_hex(8)
+        self.field_limits = dict(booking_field_limits)
+        self.email_pattern = EMAIL_PATTERN
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class StandInControl:
+    """Client for the control endpoints of a stand-in, in-process or external"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip("/")
+
+    def _post(self, path):
+        request = urllib.request.Request(f"{self.base_url}/__control/{path}", data=b"", method="POST")
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return json.load(response)
+
+    def snapshot(self):
+        return self._post("snapshot")["snapshot"]
+
+    def restore(self, snapshot_id):
+        self._post(f"restore/{snapshot_id}")
+
+    def release(self, snapshot_id):
+        self._post(f"release/{snapshot_id}")
+
+
+def start_in_thread(credentials, host="127.0.0.1", port=0):
+    """Start the stand-in on a background thread; port 0 picks a free port"""
+    server = StandInServer((host, port), credentials)
+    thread = threading.Thread(target=server.serve_forever, name="booking-stand-in", daemon=True)
+    thread.start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the booking platform API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="password")
+    args = parser.parse_args(argv)
+
+    server = StandInServer((args.host, args.port), {"username": args.username, "password": args.password})
+    print(f"[STAND-IN] Listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,14 @@ valid_booking_data = {
     "firstname": "John",
     "lastname": "Doe",
     "email": "john.doe@example.com",
-    "phone": "1234567890"
+    "phone": "12345678901"
+}
+
+# Field length limits enforced by the booking API (min, max), shared by the fuzzer and the stand-in
+booking_field_limits = {
+    "firstname": [3, 18],
+    "lastname": [3, 30],
+    "phone": [11, 21]
 }
 
 invalid_booking_data = {
@@ -28,3 +35,7 @@ room_data = {
     "features": ["WiFi", "TV", "Safe"],
     "roomPrice": 100
 }
+
+targets = [
+    {"name": "production", "base_url": base_url, "api_url": api_url}
+]
@@ -0,0 +1 @@
+"""UI helpers for Playwright-driven tests; import submodules explicitly"""
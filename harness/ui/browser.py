@@ -0,0 +1,25 @@
+"""
+Отримання браузера для UI тестів: теплий browser_server.py або локальний запуск
+"""
+from harness import browser_server
+from harness.ui.constants import UIConstants
+
+
+def launch_browser(playwright, headless=None):
+    """
+    Повертає (browser, remote). Якщо доступний здоровий browser_server.py з тим самим
+    режимом headless, підключається до нього через CDP, інакше запускає Chromium локально.
+    """
+    headless = UIConstants.HEADLESS if headless is None else headless
+
+    if UIConstants.BROWSER_SERVER_MODE != "off":
+        endpoint = browser_server.healthy_endpoint(headless)
+        if endpoint:
+            try:
+                browser = playwright.chromium.connect_over_cdp(endpoint)
+                browser_server.touch()
+                return browser, True
+            except Exception as e:
+                print(f"[ПОПЕРЕДЖЕННЯ] Не вдалося підключитися до {endpoint}, локальний запуск: {e}")
+
+    return playwright.chromium.launch(headless=headless), False
@@ -0,0 +1,147 @@
+"""
+Захоплення артефактів UI тестів лише при падінні: trace, скріншот та DOM
+"""
+import json
+import os
+import re
+import shutil
+import time
+from collections import deque
+
+from harness.ui.constants import UIConstants
+
+
+class ArtifactStore:
+    """Каталог артефактів з обмеженням загального розміру на диску"""
+
+    def __init__(self, root=None, max_bytes=None):
+        self.root = root or UIConstants.ARTIFACTS_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else UIConstants.ARTIFACTS_MAX_BYTES
+
+    def new_run_dir(self, test_name):
+        """Створює окремий каталог для артефактів одного тесту"""
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", test_name)[:100]
+        run_dir = os.path.join(self.root, f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_name}")
+        os.makedirs(run_dir, exist_ok=True)
+        return run_dir
+
+    @staticmethod
+    def _dir_size(path):
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, filename))
+                except OSError:
+                    continue
+        return total
+
+    def enforce_limit(self, keep=None):
+        """Видаляє найстаріші каталоги, доки загальний розмір не вкладеться в ліміт"""
+        if not os.path.isdir(self.root):
+            return
+        runs = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if os.path.isdir(path):
+                runs.append((os.path.getmtime(path), path, self._dir_size(path)))
+        runs.sort()
+
+        total = sum(size for _, _, size in runs)
+        for _, path, size in runs:
+            if total <= self.max_bytes:
+                break
+            if keep and os.path.abspath(path) == os.path.abspath(keep):
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+
+        if total > self.max_bytes:
+            print(f"[ПОПЕРЕДЖЕННЯ] Артефакти займають {total} байт, що перевищує ліміт {self.max_bytes}")
+
+
+class FailureCapture:
+    """
+    Кільцевий буфер подій сторінки для одного контексту та, в режимі "on-failure",
+    trace-чанк Playwright. Буфер обмежений, trace - ні: він росте весь тест.
+    Артефакти записуються на диск лише тоді, коли тест падає.
+    """
+
+    def __init__(self, context, page, test_name, mode=None, store=None, buffer_size=None):
+        self.context = context
+        self.page = page
+        self.test_name = test_name
+        self.mode = mode or UIConstants.CAPTURE_MODE
+        if self.mode not in UIConstants.CAPTURE_MODES:
+            raise ValueError(f"Невідомий режим захоплення '{self.mode}', "
+                             f"допустимі: {', '.join(UIConstants.CAPTURE_MODES)}")
+        self.store = store or ArtifactStore()
+        self.events = deque(maxlen=buffer_size or UIConstants.EVENT_BUFFER_SIZE)
+        self.tracing = False
+
+    def _record(self, kind, **details):
+        self.events.append({"time": round(time.time(), 3), "type": kind, **details})
+
+    def _on_navigation(self, frame):
+        if frame == self.page.main_frame:
+            self._record("navigation", url=frame.url)
+
+    def start(self):
+        """Підписується на події сторінки та відкриває trace-чанк"""
+        if self.mode == "off":
+            return
+
+        self.page.on("console", lambda msg: self._record("console", level=msg.type, text=msg.text))
+        self.page.on("pageerror", lambda error: self._record("pageerror", text=str(error)))
+        self.page.on("framenavigated", self._on_navigation)
+        self.page.on("requestfailed", lambda request: self._record(
+            "requestfailed", method=request.method, url=request.url, error=request.failure))
+        self.page.on("response", lambda response: self._record(
+            "response", method=response.request.method, url=response.url, status=response.status))
+
+        if self.mode == "on-failure":
+            try:
+                self.context.tracing.start(screenshots=True, snapshots=True)
+                self.context.tracing.start_chunk(title=self.test_name)
+                self.tracing = True
+            except Exception as e:
+                print(f"[ПОПЕРЕДЖЕННЯ] Не вдалося запустити tracing: {e}")
+
+    def finalize(self, failed):
+        """Зберігає артефакти при падінні тесту або відкидає trace-чанк при успіху"""
+        if self.mode == "off":
+            return None
+
+        run_dir = self.store.new_run_dir(self.test_name) if failed else None
+
+        if self.tracing:
+            try:
+                if failed:
+                    self.context.tracing.stop_chunk(path=os.path.join(run_dir, "trace.zip"))
+                else:
+                    self.context.tracing.stop_chunk()
+                self.context.tracing.stop()
+            except Exception as e:
+                print(f"[ПОПЕРЕДЖЕННЯ] Не вдалося зупинити tracing: {e}")
+            self.tracing = False
+
+        if not failed:
+            return None
+
+        try:
+            self.page.screenshot(path=os.path.join(run_dir, "screenshot.png"), full_page=True)
+        except Exception as e:
+            print(f"[ПОПЕРЕДЖЕННЯ] Не вдалося зробити скріншот: {e}")
+
+        try:
+            with open(os.path.join(run_dir, "dom.html"), "w", encoding="utf-8") as file:
+                file.write(self.page.content())
+        except Exception as e:
+            print(f"[ПОПЕРЕДЖЕННЯ] Не вдалося зберегти DOM: {e}")
+
+        with open(os.path.join(run_dir, "events.json"), "w", encoding="utf-8") as file:
+            json.dump(list(self.events), file, ensure_ascii=False, indent=2)
+
+        self.store.enforce_limit(keep=run_dir)
+        print(f"[АРТЕФАКТИ] {self.test_name}: {run_dir}")
+        return run_dir
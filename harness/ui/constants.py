@@ -1,6 +1,10 @@
 """
 Константи та селектори для UI тестів бронювання кімнат
 """
+import os
+
+from harness import ROOT_DIR
+
 
 class UISelectors:
     """Селектори для елементів UI"""
@@ -119,6 +123,84 @@ class UISelectors:
     ]
 
 
+class UIScripts:
+    """JavaScript, що виконується всередині сторінки через page.evaluate"""
+
+    # Спільна частина: обхід лише видимих текстових вузлів
+    _VISIBLE_TEXT_WALKER = """
+        const skipTags = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'TEMPLATE']);
+        const visibility = new WeakMap();
+        const isVisible = (el) => {
+            if (visibility.has(el)) return visibility.get(el);
+            const style = window.getComputedStyle(el);
+            const result = style.visibility !== 'hidden' && style.display !== 'none'
+                && el.getClientRects().length > 0;
+            visibility.set(el, result);
+            return result;
+        };
+        const textWalker = (root) => document.createTreeWalker(root, NodeFilter.SHOW_TEXT, {
+            acceptNode(node) {
+                const el = node.parentElement;
+                if (!el || skipTags.has(el.tagName) || !node.nodeValue.trim() || !isVisible(el)) {
+                    return NodeFilter.FILTER_REJECT;
+                }
+                return NodeFilter.FILTER_ACCEPT;
+            }
+        });
+    """
+
+    # Пошук ключових слів у видимому тексті; повертає лише знайдені слова та їх розташування
+    TEXT_SEARCH = """({keywords, scope}) => {
+        const root = scope ? document.querySelector(scope) : document.body;
+        if (!root) return [];
+        %s
+        const describe = (el) => {
+            const parts = [];
+            for (let node = el; node && node !== document.body && parts.length < 4; node = node.parentElement) {
+                let part = node.tagName.toLowerCase();
+                if (node.id) part += '#' + node.id;
+                else if (node.classList.length) part += '.' + Array.from(node.classList).slice(0, 2).join('.');
+                parts.unshift(part);
+            }
+            return parts.join(' > ');
+        };
+        const pending = new Map(keywords.map((keyword) => [keyword.toLowerCase(), keyword]));
+        const matches = [];
+        const walker = textWalker(root);
+        while (pending.size && walker.nextNode()) {
+            const text = walker.currentNode.nodeValue;
+            const lowered = text.toLowerCase();
+            for (const [needle, keyword] of pending) {
+                if (!lowered.includes(needle)) continue;
+                const el = walker.currentNode.parentElement;
+                const rect = el.getBoundingClientRect();
+                matches.push({
+                    keyword: keyword,
+                    text: text.trim().slice(0, 200),
+                    element: describe(el),
+                    rect: {x: rect.x, y: rect.y, width: rect.width, height: rect.height}
+                });
+                pending.delete(needle);
+            }
+        }
+        return matches;
+    }""" % _VISIBLE_TEXT_WALKER
+
+    # Довжина видимого тексту сторінки або піддерева без серіалізації DOM
+    VISIBLE_TEXT_LENGTH = """({scope}) => {
+        const root = scope ? document.querySelector(scope) : document.body;
+        if (!root) return 0;
+        %s
+        let length = 0;
+        const walker = textWalker(root);
+        while (walker.nextNode()) length += walker.currentNode.nodeValue.trim().length;
+        return length;
+    }""" % _VISIBLE_TEXT_WALKER
+
+    # Кількість елементів у DOM документа
+    DOM_NODE_COUNT = "() => document.getElementsByTagName('*').length"
+
+
 class UIConstants:
     """Константи для UI тестів"""
     
@@ -132,6 +214,10 @@ class UIConstants:
     TIMEOUT_CALENDAR_INTERACTION = 1000
     TIMEOUT_MOUSE_MOVE = 1000
     TIMEOUT_ADDITIONAL_WAIT = 5000
+    TIMEOUT_BOOKING_RESPONSE = 10000
+
+    # Шлях API, на який браузер відправляє форму бронювання
+    BOOKING_API_PATH = "/booking"
     
     # Дати для тестування
     DEFAULT_CHECKIN_DAYS = 7
@@ -147,13 +233,46 @@ class UIConstants:
     
     # Мінімальний розмір контенту сторінки
     MIN_PAGE_CONTENT_LENGTH = 100
+
+    # Режим браузера: UI_HEADLESS=1 - без вікна.
+    # UI_BROWSER_SERVER=auto - підключення до запущеного browser_server.py, якщо він доступний,
+    # інакше локальний запуск; off - завжди локальний запуск
+    HEADLESS = os.environ.get("UI_HEADLESS", "false").lower() in ("1", "true", "yes")
+    BROWSER_SERVER_MODE = os.environ.get("UI_BROWSER_SERVER", "auto")
+
+    # Захоплення артефактів при падінні тестів
+    # Режими: "off" - вимкнено; "events" (за замовчуванням) - обмежений кільцевий буфер подій,
+    # а при падінні ще скріншот і DOM; "on-failure" - додатково Playwright trace зі скріншотами
+    # та DOM-знімками. Trace пишеться протягом усього тесту й не обмежений за розміром, тож
+    # коштує часу та пам'яті в кожному тесті, навіть якщо при успіху його відкидають
+    CAPTURE_MODES = ("off", "events", "on-failure")
+    CAPTURE_MODE = os.environ.get("UI_CAPTURE_MODE", "events")
+    ARTIFACTS_DIR = os.environ.get("UI_ARTIFACTS_DIR", os.path.join(ROOT_DIR, "test-artifacts"))
+    ARTIFACTS_MAX_BYTES = int(os.environ.get("UI_ARTIFACTS_MAX_MB", "200")) * 1024 * 1024
+    EVENT_BUFFER_SIZE = 200
+
+    # Моніторинг ресурсів UI-тестів: CPU та RSS процесів браузера, лічильники CDP,
+    # DOM-вузли та передані байти. UI_RESOURCE_MONITOR=off вимикає його.
+    # Бюджети нижче - значення за замовчуванням; тест перевизначає їх маркером
+    # @pytest.mark.resource_budget(cpu_seconds=..., context_rss_mb=..., ...)
+    RESOURCE_MONITOR = os.environ.get("UI_RESOURCE_MONITOR", "on").lower() != "off"
+    RESOURCE_SAMPLE_INTERVAL = float(os.environ.get("UI_RESOURCE_SAMPLE_INTERVAL", "0.25"))
+    RESOURCE_BUDGETS = {
+        "cpu_seconds": 30.0,
+        "context_rss_mb": 500.0,
+        "transferred_mb": 25.0,
+        "dom_nodes": 5000,
+        "js_heap_mb": 150.0
+    }
+    # Частка пам'яті та ядер машини, яку можна віддати під контексти браузера
+    CAPACITY_HEADROOM = 0.8
     
     # Дані для тестового бронювання через API
     API_TEST_BOOKING_DATA = {
         "firstname": "Test",
         "lastname": "User",
         "email": "test@example.com",
-        "phone": "1234567890",
+        "phone": "12345678901",
         "bookingdates": {
             "checkin": TEST_BOOKING_CHECKIN,
             "checkout": TEST_BOOKING_CHECKOUT
@@ -212,13 +331,28 @@ class UIHelpers:
         return False
     
     @staticmethod
-    def check_content_keywords(page, keywords):
-        """Перевіряє наявність ключових слів у контенті сторінки"""
+    def find_text(page, keywords, scope=None):
+        """
+        Шукає ключові слова у видимому тексті сторінки (або піддерева scope) всередині браузера.
+        Повертає лише знайдені слова з текстом та розташуванням елемента.
+        """
+        try:
+            return page.evaluate(UIScripts.TEXT_SEARCH, {"keywords": list(keywords), "scope": scope})
+        except:
+            return []
+
+    @staticmethod
+    def get_visible_text_length(page, scope=None):
+        """Повертає довжину видимого тексту сторінки без передачі HTML"""
         try:
-            page_content = page.content()
-            return any(keyword in page_content.lower() for keyword in keywords)
+            return page.evaluate(UIScripts.VISIBLE_TEXT_LENGTH, {"scope": scope})
         except:
-            return False
+            return 0
+
+    @staticmethod
+    def check_content_keywords(page, keywords, scope=None):
+        """Перевіряє наявність ключових слів у видимому тексті сторінки"""
+        return len(UIHelpers.find_text(page, keywords, scope)) > 0
     
     @staticmethod
     def count_booking_elements(page):
@@ -0,0 +1,177 @@
+"""
+Моніторинг ресурсів одного UI-тесту: CPU та RSS процесів браузера, лічильники
+продуктивності CDP, кількість DOM-вузлів та передані мережею байти
+"""
+import os
+import threading
+import time
+
+from harness.process_stats import MB, available_memory, process_table, process_tree
+from harness.ui.constants import UIConstants, UIScripts
+
+
+class ResourceUsage:
+    """Ресурси, спожиті браузером під час одного тесту"""
+
+    METRICS = ("cpu_seconds", "context_rss_mb", "transferred_mb", "dom_nodes", "js_heap_mb")
+
+    def __init__(self, test_name):
+        self.test_name = test_name
+        self.duration = 0.0
+        self.cpu_seconds = None
+        self.baseline_rss_mb = None
+        self.peak_rss_mb = None
+        self.transferred_mb = 0.0
+        self.requests = 0
+        self.dom_nodes = None
+        self.js_heap_mb = None
+
+    @property
+    def context_rss_mb(self):
+        """Приріст пам'яті процесів браузера понад стан до створення контексту"""
+        if self.peak_rss_mb is None or self.baseline_rss_mb is None:
+            return None
+        return max(0.0, self.peak_rss_mb - self.baseline_rss_mb)
+
+    @property
+    def cpu_cores(self):
+        """Середня кількість зайнятих ядер за час тесту"""
+        if self.cpu_seconds is None or not self.duration:
+            return None
+        return self.cpu_seconds / self.duration
+
+    def over_budget(self, budgets):
+        """Повідомлення про кожну метрику, що перевищила свій бюджет"""
+        violations = []
+        for metric in self.METRICS:
+            limit, value = budgets.get(metric), getattr(self, metric)
+            if limit is not None and value is not None and value > limit:
+                violations.append(f"{metric} = {round(value, 1)}, бюджет {limit}")
+        return violations
+
+    def describe(self):
+        def fmt(value, pattern):
+            return "-" if value is None else pattern.format(value)
+        return (f"cpu {fmt(self.cpu_seconds, '{:.1f}')}s ({fmt(self.cpu_cores, '{:.2f}')} ядра), "
+                f"RSS контексту {fmt(self.context_rss_mb, '{:.0f}')} MB (пік {fmt(self.peak_rss_mb, '{:.0f}')} MB), "
+                f"мережа {self.transferred_mb:.1f} MB / {self.requests} запитів, "
+                f"DOM {fmt(self.dom_nodes, '{}')} вузлів, JS heap {fmt(self.js_heap_mb, '{:.1f}')} MB")
+
+
+class ContextMonitor:
+    """
+    Знімає метрики браузера для одного контексту: процеси браузера опитуються у фоновому
+    потоці (лише /proc або psutil, без викликів Playwright), метрики сторінки - через CDP.
+    Процеси браузера спільні для всіх контекстів, тож CPU та RSS точні лише при
+    послідовному виконанні тестів в одному браузері.
+    """
+
+    def __init__(self, context, page, test_name, browser_roots, interval=None):
+        self.context = context
+        self.page = page
+        self.browser_roots = set(browser_roots)
+        self.interval = interval or UIConstants.RESOURCE_SAMPLE_INTERVAL
+        self.usage = ResourceUsage(test_name)
+        self.cdp = None
+        self._started = None
+        self._cpu_start = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._stopped = False
+
+    def _browser_totals(self):
+        """(CPU секунди, RSS MB) усіх процесів браузера або None, якщо таблиця процесів недоступна"""
+        processes = process_table()
+        if processes is None:
+            return None
+        browser = process_tree(processes, self.browser_roots) - {os.getpid()}
+        return (sum(processes[pid].cpu_seconds for pid in browser),
+                sum(processes[pid].rss for pid in browser) / MB)
+
+    def _track_peak(self, totals):
+        if totals is not None:
+            self.usage.peak_rss_mb = max(self.usage.peak_rss_mb or 0.0, totals[1])
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            self._track_peak(self._browser_totals())
+
+    def _on_loading_finished(self, event):
+        self.usage.transferred_mb += event.get("encodedDataLength", 0) / MB
+        self.usage.requests += 1
+
+    def start(self):
+        """Фіксує базовий стан процесів та підписується на лічильники CDP"""
+        self._started = time.perf_counter()
+        totals = self._browser_totals()
+        if totals is not None:
+            self._cpu_start, self.usage.baseline_rss_mb = totals
+            self._track_peak(totals)
+            self._thread = threading.Thread(target=self._sample_loop, name="ui-resource-monitor", daemon=True)
+            self._thread.start()
+
+        try:
+            self.cdp = self.context.new_cdp_session(self.page)
+            self.cdp.send("Performance.enable")
+            self.cdp.send("Network.enable")
+            self.cdp.on("Network.loadingFinished", self._on_loading_finished)
+        except Exception as e:
+            self.cdp = None
+            print(f"[ПОПЕРЕДЖЕННЯ] CDP недоступний, метрики сторінки не збираються: {e}")
+
+    def stop(self):
+        """Зупиняє опитування та збирає метрики сторінки; повторний виклик повертає той самий результат"""
+        if self._stopped:
+            return self.usage
+        self._stopped = True
+        self.usage.duration = time.perf_counter() - self._started
+
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        totals = self._browser_totals()
+        if totals is not None and self._cpu_start is not None:
+            self._track_peak(totals)
+            self.usage.cpu_seconds = max(0.0, totals[0] - self._cpu_start)
+
+        try:
+            self.usage.dom_nodes = self.page.evaluate(UIScripts.DOM_NODE_COUNT)
+        except Exception as e:
+            print(f"[ПОПЕРЕДЖЕННЯ] Не вдалося порахувати DOM-вузли: {e}")
+
+        if self.cdp:
+            try:
+                metrics = {m["name"]: m["value"] for m in self.cdp.send("Performance.getMetrics")["metrics"]}
+                if "JSHeapUsedSize" in metrics:
+                    self.usage.js_heap_mb = metrics["JSHeapUsedSize"] / MB
+                self.cdp.detach()
+            except Exception as e:
+                print(f"[ПОПЕРЕДЖЕННЯ] Не вдалося отримати метрики CDP: {e}")
+        return self.usage
+
+
+def recommend_contexts(usages, memory=None, cpus=None, headroom=None):
+    """
+    Скільки контекстів браузера одночасно вміщує машина за найважчим виміряним тестом.
+    Повертає (кількість, пояснення) або (None, причина), якщо даних недостатньо.
+    """
+    headroom = headroom or UIConstants.CAPACITY_HEADROOM
+    memory = memory if memory is not None else available_memory()
+    cpus = cpus or os.cpu_count() or 1
+
+    per_context_rss = max((u.context_rss_mb for u in usages if u.context_rss_mb), default=None)
+    per_context_cores = max((u.cpu_cores for u in usages if u.cpu_cores), default=None)
+    if not per_context_rss and not per_context_cores:
+        return None, "немає вимірів CPU чи пам'яті процесів браузера"
+
+    limits = []
+    if per_context_rss and memory:
+        limits.append((memory / MB * headroom / per_context_rss,
+                       f"пам'ять: {memory / MB:.0f} MB доступно, до {per_context_rss:.0f} MB на контекст"))
+    if per_context_cores:
+        limits.append((cpus * headroom / per_context_cores,
+                       f"CPU: {cpus} ядер, до {per_context_cores:.2f} ядра на контекст"))
+    if not limits:
+        return None, "невідомий обсяг доступної пам'яті"
+    fit, reason = min(limits)
+    return max(1, int(fit)), f"обмежує {reason}, запас {headroom:.0%}"
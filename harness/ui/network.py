@@ -0,0 +1,73 @@
+"""
+Визначення результату бронювання за мережевою відповіддю браузера
+"""
+from urllib.parse import urlparse
+
+from harness.ui.constants import UIConstants
+from harness.utils import extract_error_messages
+
+
+class BookingOutcome:
+    """Структурований результат відправки форми бронювання"""
+
+    def __init__(self, submitted, status=None, booking_id=None, errors=None, body=None):
+        self.submitted = submitted
+        self.status = status
+        self.booking_id = booking_id
+        self.errors = errors or []
+        self.body = body
+
+    @property
+    def success(self):
+        return self.submitted and self.status is not None and 200 <= self.status < 300
+
+    def __repr__(self):
+        return (f"BookingOutcome(submitted={self.submitted}, status={self.status}, "
+                f"booking_id={self.booking_id}, errors={self.errors})")
+
+
+def is_booking_submission(response):
+    """Чи є відповідь результатом POST-запиту на створення бронювання"""
+    if response.request.method != "POST":
+        return False
+    path = urlparse(response.url).path.rstrip("/")
+    return path.endswith(UIConstants.BOOKING_API_PATH)
+
+
+def _extract_booking_id(body):
+    if not isinstance(body, dict):
+        return None
+    booking = body.get("booking") if isinstance(body.get("booking"), dict) else body
+    return body.get("bookingid") or booking.get("bookingid") or booking.get("id")
+
+
+def submit_booking(page, submit, on_created=None, timeout=None):
+    """
+    Виконує submit() та перехоплює POST бронювання, відправлений самим браузером.
+    Повертає BookingOutcome одразу після надходження відповіді; ID створеного
+    бронювання передається в on_created для подальшого очищення.
+    """
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+    timeout = timeout or UIConstants.TIMEOUT_BOOKING_RESPONSE
+    try:
+        with page.expect_response(is_booking_submission, timeout=timeout) as response_info:
+            submit()
+        response = response_info.value
+    except PlaywrightTimeoutError:
+        # Браузер не відправив запит (наприклад, спрацювала клієнтська валідація)
+        return BookingOutcome(submitted=False)
+
+    try:
+        body = response.json()
+    except Exception:
+        body = response.text()
+
+    outcome = BookingOutcome(submitted=True, status=response.status, body=body)
+    if outcome.success:
+        outcome.booking_id = _extract_booking_id(body)
+        if outcome.booking_id and on_created:
+            on_created(str(outcome.booking_id))
+    else:
+        outcome.errors = extract_error_messages(body)
+    return outcome
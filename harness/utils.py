@@ -0,0 +1,374 @@
+import json
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timedelta
+import time
+from harness import ROOT_DIR
+from harness.cleanup_ledger import CleanupLedger
+from harness.rate_limiter import RateLimiter, RateLimitedSession
+from harness.test_data import base_url, api_url, admin_credentials, valid_booking_data, invalid_booking_data, room_data, targets
+
+HTTP_POOL_SIZE = 16
+
+
+class ApiError(Exception):
+    """The API rejected a request; ``status`` and ``body`` hold its response when there was one"""
+
+    def __init__(self, message, status=None, body=None):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+
+
+class AmbiguousApiError(ApiError):
+    """The outcome is unknown (timeout, dropped connection or 5xx), so a create may have taken effect"""
+
+
+def extract_error_messages(body):
+    """Extract validation messages from an API error body in any of its known shapes"""
+    if isinstance(body, str):
+        return [body] if body.strip() else []
+    if isinstance(body, list):
+        return [str(item.get("message", item)) if isinstance(item, dict) else str(item) for item in body]
+    if isinstance(body, dict):
+        for key in ("errors", "fieldErrors", "messages"):
+            if key in body:
+                return extract_error_messages(body[key])
+        for key in ("error", "message"):
+            if body.get(key):
+                return [str(body[key])]
+    return []
+
+
+class TestUtilities:
+    """Utility class for common test operations and data management"""
+
+    def __init__(self):
+        self.test_data_file = os.path.join(ROOT_DIR, "test_data.json")
+        self.test_data = self.get_test_data()
+        self.base_url = self.test_data["base_url"]
+        self.api_url = self.test_data.get("api_url", f"{self.base_url}/booking")
+        self.admin_credentials = self.test_data["admin_credentials"]
+        # Every request takes a token from the limiter shared by all workers hitting the target
+        self.session = RateLimitedSession(RateLimiter.from_config(self.test_data))
+        # Room for concurrent batch creation and cleanup sweeps on one session
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE))
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE))
+        self.ledger = CleanupLedger()
+        self._auth_token = None
+        # Оновлюємо test_data з актуальними даними
+        self.test_data.update({
+            "valid_booking_data": valid_booking_data,
+            "invalid_booking_data": invalid_booking_data,
+            "room_data": room_data
+        })
+
+    def get_test_data(self):
+        
+        try:
+            with open(self.test_data_file, 'r') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            print(f"Warning: {self.test_data_file} not found, using fallback data")
+        
+            data = {
+                "base_url": base_url,
+                "api_url": api_url,
+                "admin_credentials": admin_credentials,
+                "valid_booking_data": valid_booking_data,
+                "invalid_booking_data": invalid_booking_data,
+                "room_data": room_data,
+                "targets": targets
+            }
+        except json.JSONDecodeError as e:
+            print(f"Error: Invalid JSON in {self.test_data_file}: {e}")
+            
+            data = {
+                "base_url": base_url,
+                "api_url": api_url,
+                "admin_credentials": admin_credentials,
+                "valid_booking_data": valid_booking_data,
+                "invalid_booking_data": invalid_booking_data,
+                "room_data": room_data,
+                "targets": targets
+            }
+
+        # AQA_TARGET selects one of the configured targets, e.g. for a multi-environment fan-out
+        target_name = os.environ.get("AQA_TARGET")
+        if target_name:
+            configured = {target["name"]: target for target in data.get("targets", [])}
+            if target_name not in configured:
+                raise ValueError(f"Unknown target {target_name!r}, configured: {', '.join(configured) or 'none'}")
+            target = configured[target_name]
+            data.update({key: value for key, value in target.items() if key != "name"})
+            data["api_url"] = target.get("api_url", f"{data['base_url']}/booking")
+
+        # AQA_BASE_URL points the whole run at another target, e.g. a local stand-in server
+        target_url = os.environ.get("AQA_BASE_URL")
+        if target_url:
+            data["base_url"] = target_url.rstrip("/")
+            data["api_url"] = f"{data['base_url']}/booking"
+        return data
+
+    def get_admin_auth_token(self, refresh=False):
+        """Get authentication token for admin operations, logging in once per instance"""
+        if self._auth_token and not refresh:
+            return self._auth_token
+        try:
+            login_url = f"{self.base_url}/auth/login"
+            headers = {
+                "Content-Type": "application/json",
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            }
+            
+            response = self.session.post(
+                login_url, 
+                json=self.admin_credentials,
+                headers=headers,
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                self._auth_token = data.get("token")
+                return self._auth_token
+            else:
+                print(f"[API LOGIN FAIL] Status: {response.status_code}, Response: {response.text}")
+        except Exception as e:
+            print(f"[API LOGIN FAIL] Exception: {e}")
+        return None
+
+    def _request_json(self, method, url, action, ok=(200, 201), **kwargs):
+        """Send a request and return its JSON body, raising ApiError or AmbiguousApiError"""
+        try:
+            response = self.session.request(method, url, timeout=30, **kwargs)
+        except requests.RequestException as e:
+            raise AmbiguousApiError(f"{action}: {e}") from e
+        if response.status_code in ok:
+            try:
+                return response.json()
+            except ValueError as e:
+                # The request succeeded but its result is unreadable, so a create may well have happened
+                raise AmbiguousApiError(f"{action}: Status {response.status_code}, body is not JSON: "
+                                        f"{response.text[:200]}", response.status_code, response.text) from e
+        error = AmbiguousApiError if response.status_code >= 500 else ApiError
+        raise error(f"{action}: Status {response.status_code}, {response.text}", response.status_code, response.text)
+
+    def create_test_room(self, room_data=None):
+        """Create a test room and return room ID"""
+        if not room_data:
+            room_data = self.test_data["room_data"]
+
+        token = self.get_admin_auth_token()
+        if not token:
+            raise ApiError("Failed to get admin token")
+            
+        headers = {
+            "Content-Type": "application/json",
+            "Cookie": f"token={token}",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
+
+        result = self._request_json("POST", f"{self.base_url}/room", "Failed to create test room",
+                                    json=room_data, headers=headers)
+        room_id = result.get("roomid") or result.get("id")
+        self.ledger.record("room", room_id, self.base_url)
+        return room_id
+
+    def delete_test_room(self, room_id):
+        """Delete a test room"""
+        token = self.get_admin_auth_token()
+        if not token:
+            return False
+            
+        headers = {
+            "Content-Type": "application/json",
+            "Cookie": f"token={token}",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
+
+        try:
+            response = self.session.delete(
+                f"{self.base_url}/room/{room_id}", 
+                headers=headers,
+                timeout=30
+            )
+            if response.status_code in [200, 202, 204]:
+                self.ledger.mark_deleted("room", room_id, self.base_url)
+                return True
+            return False
+        except Exception as e:
+            print(f"Failed to delete room {room_id}: {e}")
+            return False
+
+    def get_available_rooms(self):
+        """Get list of available rooms"""
+        try:
+            return self.list_rooms()
+        except ApiError as e:
+            print(f"Failed to get rooms: {e}")
+        return []
+
+    def list_rooms(self):
+        """Get every room on the target, raising ApiError when the list cannot be fetched"""
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
+        data = self._request_json("GET", f"{self.base_url}/room/", "Failed to get rooms", ok=(200,), headers=headers)
+        return data.get("rooms", [])
+
+    def list_room_bookings(self, room_id):
+        """Get every booking of a room, raising ApiError when the list cannot be fetched"""
+        token = self.get_admin_auth_token()
+        if not token:
+            raise ApiError("Failed to get admin token")
+
+        headers = {
+            "Cookie": f"token={token}",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
+        data = self._request_json("GET", f"{self.base_url}/booking/", "Failed to get bookings", ok=(200,),
+                                  params={"roomid": room_id}, headers=headers)
+        return data.get("bookings", [])
+
+    def build_booking_payload(self, room_id, booking_data=None, checkin=None, checkout=None):
+        """Build the booking request body; dates default to today and tomorrow"""
+        if not booking_data:
+            booking_data = self.test_data["valid_booking_data"]
+
+        checkin = checkin or datetime.today().date()
+        checkout = checkout or checkin + timedelta(days=1)
+
+        return {
+            "bookingdates": {
+                "checkin": checkin.strftime("%Y-%m-%d"),
+                "checkout": checkout.strftime("%Y-%m-%d")
+            },
+            "roomid": room_id,
+            "firstname": booking_data["firstname"],
+            "lastname": booking_data["lastname"],
+            "email": booking_data["email"],
+            "phone": booking_data["phone"]
+        }
+
+    def create_test_booking(self, room_id, booking_data=None):
+        """Create a test booking and return booking ID"""
+        payload = self.build_booking_payload(room_id, booking_data)
+
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
+        result = self._request_json("POST", f"{self.base_url}/booking/", "Booking failed", json=payload, headers=headers)
+        booking_id = result.get("bookingid") or result.get("id")
+        self.ledger.record("booking", booking_id, self.base_url)
+        return booking_id
+
+    def cleanup_test_rooms(self, api_base, headers):
+        """Delete all rooms with 'Test' in their name"""
+        try:
+            response = self.session.get(api_base, headers=headers, timeout=30)
+            if response.status_code == 200:
+                data = response.json()
+                rooms = data.get("rooms", [])
+                for room in rooms:
+                    room_name = room.get("roomName", "")
+                    if "Test" in room_name:
+                        room_id = room.get("roomid") or room.get("id")
+                        if room_id:
+                            self.delete_room(api_base, room_id, headers)
+                            time.sleep(0.5)  # Small delay between deletions
+        except Exception as e:
+            print(f"Cleanup failed: {e}")
+
+    def create_room(self, api_base, room_data, headers):
+        """Create a room via API"""
+        result = self._request_json("POST", api_base, "Failed to create room", json=room_data, headers=headers)
+        self.ledger.record("room", result.get("roomid") or result.get("id"), self.base_url)
+        return result
+
+    def delete_room(self, api_base, room_id, headers):
+        """Delete a room via API"""
+        try:
+            response = self.session.delete(f"{api_base}/{room_id}", headers=headers, timeout=30)
+            if response.status_code in [200, 202, 204]:
+                self.ledger.mark_deleted("room", room_id, self.base_url)
+                return True
+            return False
+        except Exception as e:
+            print(f"Failed to delete room {room_id}: {e}")
+            return False
+
+    def create_booking(self, booking_api, booking_data):
+        """Create a booking via API"""
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
+        result = self._request_json("POST", booking_api, "Failed to create booking", json=booking_data, headers=headers)
+        self.ledger.record("booking", result.get("bookingid") or result.get("id"), self.base_url)
+        return result
+
+    def delete_booking(self, booking_api, booking_id, headers):
+        """Delete a booking via API"""
+        try:
+            response = self.session.delete(f"{booking_api}/{booking_id}", headers=headers, timeout=30)
+            if response.status_code in [200, 202, 204]:
+                self.ledger.mark_deleted("booking", booking_id, self.base_url)
+                return True
+            return False
+        except Exception as e:
+            print(f"Failed to delete booking {booking_id}: {e}")
+            return False
+
+    def wait_for_api_response(self, url, method="GET", data=None, headers=None, timeout=30, retries=3):
+        """Wait for API response with retries"""
+        for attempt in range(retries):
+            try:
+                if method.upper() == "GET":
+                    response = self.session.get(url, headers=headers, timeout=timeout)
+                elif method.upper() == "POST":
+                    response = self.session.post(url, json=data, headers=headers, timeout=timeout)
+                elif method.upper() == "DELETE":
+                    response = self.session.delete(url, headers=headers, timeout=timeout)
+                else:
+                    raise ValueError(f"Unsupported HTTP method: {method}")
+                
+                if response.status_code < 500:  # Don't retry client errors
+                    return response
+                    
+            except Exception as e:
+                if attempt == retries - 1:
+                    raise e
+                time.sleep(1)  # Wait before retry
+        
+        return None
+
+    def verify_room_exists(self, room_id):
+        """Verify if a room exists"""
+        try:
+            rooms = self.get_available_rooms()
+            return any(room.get("roomid") == room_id or room.get("id") == room_id for room in rooms)
+        except:
+            return False
+
+    def get_booking_details(self, booking_id):
+        """Get booking details by ID"""
+        try:
+            token = self.get_admin_auth_token()
+            if not token:
+                return None
+                
+            headers = {
+                "Content-Type": "application/json",
+                "Cookie": f"token={token}",
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            }
+            
+            response = self.session.get(f"{self.api_url}/{booking_id}", headers=headers, timeout=30)
+            if response.status_code == 200:
+                return response.json()
+        except Exception as e:
+            print(f"Failed to get booking details: {e}")
+        return None
\ No newline at end of file
@@ -1,27 +1,26 @@
 import pytest
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils import TestUtils
+
 
 class TestAdminAPI:
     """Admin API Test Suite"""
 
     @pytest.fixture(scope="class", autouse=True)
-    def setup_class(self):
+    @classmethod
+    def setup_class(cls, utils):
         """Initialize test utils and shared data"""
-        self.utils = TestUtils()
-        self.token = self.utils.get_admin_auth_token()
-        assert self.token is not None, "Failed to retrieve admin token"
+        # Class-scoped fixtures run on a different instance than the tests, so share state via the class
+        cls.utils = utils
+        cls.token = cls.utils.get_admin_auth_token()
+        assert cls.token is not None, "Failed to retrieve admin token"
 
-        self.headers = {
+        cls.headers = {
             "Content-Type": "application/json",
-            "Cookie": f"token={self.token}",
+            "Cookie": f"token={cls.token}",
             "User-Agent": "pytest"
         }
 
-        self.api_base = f"{self.utils.base_url}/room"
-        self.booking_api = f"{self.utils.base_url}/booking"
+        cls.api_base = f"{cls.utils.base_url}/room"
+        cls.booking_api = f"{cls.utils.base_url}/booking"
 
     def test_create_room(self):
         """Test admin can create a new room"""
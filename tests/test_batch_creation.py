@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from harness.batch import BatchCreator, find_marker
+from harness.utils import AmbiguousApiError
+
+
+@pytest.fixture(scope="module")
+def creator(utils):
+    """Batch creator whose rooms are deleted afterwards (bookings go with their rooms)"""
+    creator = BatchCreator(utils, backoff=0)
+    creator.created_room_ids = []
+    yield creator
+    for room_id in creator.created_room_ids:
+        utils.delete_test_room(room_id)
+
+
+class TestBatchCreation:
+    """Idempotent batch creation of rooms and bookings"""
+
+    def _create_rooms(self, creator, specs, markers=None):
+        result = creator.create_rooms(specs, markers)
+        creator.created_room_ids.extend(room_id for room_id in result.ids if room_id not in creator.created_room_ids)
+        return result
+
+    def test_batch_create_rooms_and_bookings(self, creator, utils):
+        """Test every spec gets its own object, in spec order"""
+        specs = [{"roomName": f"Batch Test {n}", "roomPrice": 100 + n} for n in range(3)]
+        rooms = self._create_rooms(creator, specs)
+        assert len(set(rooms.ids)) == 3 and all(rooms.ids), f"Unexpected room IDs: {rooms.ids}"
+
+        listed = {room.get("roomid"): room for room in utils.list_rooms()}
+        for (spec, room_id), marker in zip(rooms.mapping(specs), rooms.markers):
+            assert listed[room_id]["roomName"] == spec["roomName"]
+            assert find_marker(listed[room_id]["description"]) == marker
+
+        checkin = datetime.today().date() + timedelta(days=400)
+        bookings = creator.create_bookings([{"room_id": room_id, "checkin": checkin} for room_id in rooms.ids])
+        assert len(set(bookings.ids)) == 3 and all(bookings.ids), f"Unexpected booking IDs: {bookings.ids}"
+
+    def test_resumed_batch_creates_nothing_twice(self, creator, utils):
+        """Test passing the markers back returns the same objects instead of new ones"""
+        specs = [{"roomName": f"Batch Resume Test {n}"} for n in range(2)]
+        first = self._create_rooms(creator, specs)
+        rooms_before = len(utils.list_rooms())
+
+        again = self._create_rooms(creator, specs, first.markers)
+        assert again.ids == first.ids
+        assert len(utils.list_rooms()) == rooms_before, "Resuming the batch created new rooms"
+
+    def test_lost_response_is_reconciled_by_marker(self, creator, utils, monkeypatch):
+        """Test a create whose response is lost is adopted, not duplicated, on retry"""
+        create_room = utils.create_room
+        lost = []
+
+        def create_room_losing_first_response(*args, **kwargs):
+            result = create_room(*args, **kwargs)
+            if not lost:
+                lost.append(result.get("roomid"))
+                raise AmbiguousApiError("Failed to create room: Read timed out")
+            return result
+
+        monkeypatch.setattr(utils, "create_room", create_room_losing_first_response)
+        result = self._create_rooms(creator, [{"roomName": "Batch Reconcile Test"}])
+
+        assert result.ids == lost, "The room created before the lost response was not adopted"
+        assert result.reconciled == 1
+        marked = [room for room in utils.list_rooms() if find_marker(room.get("description")) == result.markers[0]]
+        assert len(marked) == 1, f"Expected one room under the marker, found {len(marked)}"
@@ -0,0 +1,60 @@
+import re
+
+import pytest
+
+from harness import utils as harness_utils
+from harness.booking_fuzzer import BookingFuzzer
+from harness.stand_in_server import start_in_thread
+
+
+@pytest.fixture(scope="module")
+def fuzzer(utils):
+    """Create a dedicated room and a fuzzer targeting it"""
+    room_id = utils.create_test_room()
+    fuzzer = BookingFuzzer(utils, room_id)
+    yield fuzzer
+    fuzzer.cleanup()
+    utils.delete_test_room(room_id)
+
+
+@pytest.fixture(scope="module")
+def gapped_fuzzer(tmp_path_factory):
+    """Fuzzer against a private stand-in that wrongly accepts long names and malformed emails"""
+    server = start_in_thread(harness_utils.TestUtilities().admin_credentials)
+    server.field_limits.update(firstname=[3, 100000], lastname=[3, 100000])
+    server.email_pattern = re.compile(r".+")
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("AQA_BASE_URL", server.base_url)
+        patch.setenv("AQA_RATE_LIMITS", "off")
+        patch.setenv("CLEANUP_LEDGER", str(tmp_path_factory.mktemp("ledger") / "ledger.jsonl"))
+        gapped_utils = harness_utils.TestUtilities()
+    fuzzer = BookingFuzzer(gapped_utils, gapped_utils.create_test_room(), seed=1)
+    yield fuzzer
+    fuzzer.cleanup()
+    server.shutdown()
+    server.server_close()
+
+
+class TestBookingValidation:
+    """Booking endpoint validation fuzzing"""
+
+    def test_booking_validation_fuzzing(self, fuzzer):
+        """Test generated invalid and boundary payloads are handled without crashes or wrong acceptance"""
+        report = fuzzer.run()
+        assert not report.findings, f"Booking validation findings:\n{report.summary()}"
+
+    def test_fuzzer_reports_each_validation_gap(self, gapped_fuzzer):
+        """Test three planted validation gaps come out as three findings, each shrunk to one mutation"""
+        report = gapped_fuzzer.run()
+
+        assert {result.finding for result in report.findings} == {"accepted-invalid"}, report.summary()
+        assert sorted(result.signature[1] for result in report.findings) == [
+            ("email",), ("firstname",), ("lastname",)], report.summary()
+
+        combined = [group[0] for (finding, signature), group in report.groups.items()
+                    if finding and len(signature[1]) > 1]
+        assert combined, "Expected sampled pairs of two wrongly accepted fields"
+        for result in report.findings + combined:
+            minimal = report.reproductions[id(result)]
+            assert len(minimal.case.mutations) == 1, f"{result.case.name} shrank to {minimal.case.name}"
+            assert minimal.case.mutations[0].field in result.signature[1]
@@ -0,0 +1,70 @@
+import json
+import subprocess
+import sys
+from types import SimpleNamespace
+
+from harness.cleanup_ledger import CleanupLedger, CleanupSweeper
+
+BASE_URL = "http://stand-in.local"
+
+
+def _write_event(ledger, **event):
+    with open(ledger.path, "a", encoding="utf-8") as file:
+        file.write(json.dumps(dict(event, base_url=BASE_URL)) + "\n")
+
+
+class TestCleanupLedger:
+    """Crash safety, compaction and ownership of the cleanup ledger"""
+
+    def test_append_after_torn_line_is_kept(self, tmp_path):
+        """Test a record written after an interrupted write is not glued onto the torn line"""
+        ledger = CleanupLedger(str(tmp_path / "ledger.jsonl"))
+        ledger.record("room", 1, BASE_URL)
+        with open(ledger.path, "a", encoding="utf-8") as file:
+            file.write('{"op":"created","kind":"room","id":"2","ba')
+        ledger.record("room", 3, BASE_URL)
+
+        assert [event["id"] for event in ledger.pending(BASE_URL)] == ["1", "3"]
+
+    def test_compact_keeps_only_pending_objects(self, tmp_path):
+        """Test compaction drops settled created/deleted pairs and keeps what is still pending"""
+        ledger = CleanupLedger(str(tmp_path / "ledger.jsonl"))
+        for room_id in range(5):
+            ledger.record("room", room_id, BASE_URL)
+        for room_id in range(4):
+            ledger.mark_deleted("room", room_id, BASE_URL)
+
+        ledger.compact()
+
+        with open(ledger.path, "r", encoding="utf-8") as file:
+            assert len(file.readlines()) == 1
+        assert [event["id"] for event in ledger.pending(BASE_URL)] == ["4"]
+
+    def test_sweep_with_nothing_pending_still_compacts(self, tmp_path):
+        """Test a clean run's sweep leaves no settled pairs behind, so the ledger does not grow run after run"""
+        ledger = CleanupLedger(str(tmp_path / "ledger.jsonl"))
+        for room_id in range(3):
+            ledger.record("room", room_id, BASE_URL)
+            ledger.mark_deleted("room", room_id, BASE_URL)
+
+        assert CleanupSweeper(SimpleNamespace(base_url=BASE_URL), ledger).sweep() == (0, 0)
+
+        with open(ledger.path, "r", encoding="utf-8") as file:
+            assert file.read() == ""
+
+    def test_sweepable_skips_objects_of_running_processes(self, tmp_path):
+        """Test objects of another live run are left alone while those of finished runs are swept"""
+        ledger = CleanupLedger(str(tmp_path / "ledger.jsonl"))
+        finished = subprocess.Popen([sys.executable, "-c", "pass"])
+        finished.wait()
+        running = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            _write_event(ledger, op="created", kind="room", id="1", pid=running.pid)
+            _write_event(ledger, op="created", kind="room", id="2", pid=finished.pid)
+            _write_event(ledger, op="created", kind="room", id="3")
+            ledger.record("room", 4, BASE_URL)
+
+            assert [event["id"] for event in ledger.sweepable(BASE_URL)] == ["2", "3", "4"]
+        finally:
+            running.kill()
+            running.wait()
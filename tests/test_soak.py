@@ -0,0 +1,15 @@
+from harness.soak import SoakRunner
+
+
+class TestSoak:
+    """Short soak run of the API booking lifecycle"""
+
+    def test_short_api_soak_stays_within_limits(self, utils):
+        """Test a few lifecycles run without errors and without resource growth past the limits"""
+        runner = SoakRunner(utils, duration=120, interval=0, config={"warmup_iterations": 2})
+        report = runner.run(max_iterations=6, progress=None)
+
+        assert report.iterations == 6
+        assert not report.errors, f"Soak iterations failed:\n{report.summary()}"
+        assert len(report.measured) >= 2, "Expected resource samples after the warm-up"
+        assert not report.failures, f"Resource growth past the limits:\n{report.summary()}"
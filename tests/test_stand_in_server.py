@@ -0,0 +1,43 @@
+import pytest
+import requests
+
+from harness.stand_in_server import StandInControl, start_in_thread
+
+
+@pytest.fixture(scope="module")
+def stand_in():
+    """Private stand-in, independent of the target the rest of the run uses"""
+    server = start_in_thread({"username": "admin", "password": "password"})
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestStandInServer:
+    """Snapshot and restore of the stand-in state"""
+
+    def test_restore_rolls_back_rooms_bookings_and_ids(self, stand_in, utils):
+        """Test a restore removes everything created after the snapshot and rewinds the ID counters"""
+        headers = {"Cookie": f"token={stand_in.token}"}
+        room_url, booking_url = f"{stand_in.base_url}/room", f"{stand_in.base_url}/booking"
+        kept_room = requests.post(room_url, json={"roomName": "Kept"}, headers=headers, timeout=10).json()["roomid"]
+        counters = dict(stand_in.store.counters)
+
+        control = StandInControl(stand_in.base_url)
+        snapshot_id = control.snapshot()
+        room_id = requests.post(room_url, json={"roomName": "Rolled back"}, headers=headers, timeout=10).json()["roomid"]
+        booking = requests.post(booking_url, json=utils.build_booking_payload(room_id), timeout=10)
+        assert booking.status_code == 201, booking.text
+        booking_id = booking.json()["bookingid"]
+
+        control.restore(snapshot_id)
+        control.release(snapshot_id)
+
+        rooms = requests.get(room_url, timeout=10).json()["rooms"]
+        assert [room["roomid"] for room in rooms] == [kept_room]
+        assert requests.get(f"{booking_url}/{booking_id}", headers=headers, timeout=10).status_code == 404
+        assert stand_in.store.counters == counters
+        assert not stand_in.store.journal, "Journal should be empty once no snapshot is open"
+
+        again = requests.post(room_url, json={"roomName": "Again"}, headers=headers, timeout=10).json()["roomid"]
+        assert again == room_id, "The room ID counter was not rewound"
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+
+def _make_run(root, name, size, mtime):
+    path = root / name
+    path.mkdir()
+    (path / "trace.zip").write_bytes(b"x" * size)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+class TestArtifactStore:
+    """Ліміт розміру каталогу артефактів UI тестів"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        # Імпорт усередині тесту: API-прогін не повинен завантажувати UI модулі під час збору
+        from harness.ui.capture import ArtifactStore, FailureCapture
+        self.ArtifactStore = ArtifactStore
+        self.FailureCapture = FailureCapture
+
+    def test_enforce_limit_evicts_oldest_runs_first(self, tmp_path):
+        """Тест видалення найстаріших каталогів, доки розмір не вкладеться в ліміт"""
+        oldest = _make_run(tmp_path, "oldest", 400, 1000)
+        older = _make_run(tmp_path, "older", 400, 2000)
+        newest = _make_run(tmp_path, "newest", 400, 3000)
+
+        self.ArtifactStore(root=str(tmp_path), max_bytes=500).enforce_limit()
+
+        assert not oldest.exists() and not older.exists()
+        assert newest.exists()
+
+    def test_enforce_limit_never_evicts_the_kept_run(self, tmp_path, capsys):
+        """Тест що каталог щойно впалого тесту лишається, навіть якщо сам перевищує ліміт"""
+        kept = _make_run(tmp_path, "kept", 800, 1000)
+        other = _make_run(tmp_path, "other", 400, 2000)
+
+        self.ArtifactStore(root=str(tmp_path), max_bytes=500).enforce_limit(keep=str(kept))
+
+        assert kept.exists() and not other.exists()
+        assert "перевищує ліміт" in capsys.readouterr().out
+
+    def test_enforce_limit_keeps_everything_under_the_cap(self, tmp_path):
+        """Тест що в межах ліміту нічого не видаляється"""
+        runs = [_make_run(tmp_path, f"run{n}", 100, 1000 + n) for n in range(3)]
+
+        self.ArtifactStore(root=str(tmp_path), max_bytes=300).enforce_limit()
+
+        assert all(run.exists() for run in runs)
+
+    def test_unknown_capture_mode_is_rejected(self, tmp_path):
+        """Тест що невідомий режим захоплення відхиляється, а не виконується мовчки як events"""
+        with pytest.raises(ValueError, match="on_failure"):
+            self.FailureCapture(None, None, "test", mode="on_failure", store=self.ArtifactStore(root=str(tmp_path)))